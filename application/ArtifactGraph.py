@@ -0,0 +1,115 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Set
+
+
+def _type_name(artifact_type: Any) -> str:
+    return getattr(artifact_type, 'value', artifact_type)
+
+
+@dataclass
+class ArtifactGraph:
+    """
+    Dependency graph between artifact types, built from the `objects` each
+    prompt template lists as its context.
+
+    Only types with a template are nodes; `sources` keeps each node's edges
+    to upstream types without one (e.g. the questionnaire), whose content is
+    expected to exist already, so changes to them still reach their dependents.
+    """
+    dependencies: Dict[str, Set[str]] = field(default_factory=dict)
+    sources: Dict[str, Set[str]] = field(default_factory=dict)
+
+    @classmethod
+    def from_templates(cls, templates: Iterable[Any]) -> 'ArtifactGraph':
+        """
+        Build the graph from prompt templates (PromptTemplate objects or dicts
+        with 'artifact_type' and 'objects').
+
+        Dependencies on types without a template are kept out of the graph's
+        nodes and recorded in `sources` instead.
+        """
+        dependencies = {}
+        for template in templates:
+            if isinstance(template, dict):
+                artifact_type, objects = template.get('artifact_type'), template.get('objects') or []
+            else:
+                artifact_type, objects = getattr(template, 'artifact_type', None), template.objects
+            if artifact_type is None:
+                continue
+            dependencies.setdefault(_type_name(artifact_type), set()).update(
+                _type_name(obj) for obj in objects
+            )
+
+        sources = {}
+        for node, upstream in dependencies.items():
+            upstream.discard(node)
+            sources[node] = upstream - set(dependencies)
+            upstream.intersection_update(dependencies)
+        return cls(dependencies, sources)
+
+    def subgraph(self, artifact_types: Iterable[Any]) -> 'ArtifactGraph':
+        """
+        Restrict the graph to the given types; edges to other types are dropped.
+        """
+        nodes = {_type_name(artifact_type) for artifact_type in artifact_types}
+        unknown = nodes - set(self.dependencies)
+        if unknown:
+            raise ValueError(f"No template found for artifact types: {sorted(unknown)}")
+        return ArtifactGraph(
+            {node: self.dependencies[node] & nodes for node in nodes},
+            {node: set(self.sources.get(node, ())) for node in nodes}
+        )
+
+    def dependents(self) -> Dict[str, Set[str]]:
+        """
+        Map each type to the types that use it as context.
+        """
+        dependents = {node: set() for node in self.dependencies}
+        for node, upstream in self.dependencies.items():
+            for dependency in upstream:
+                dependents[dependency].add(node)
+        return dependents
+
+    def downstream(self, artifact_types: Iterable[Any]) -> Set[str]:
+        """
+        The given types and every type that transitively depends on them.
+        Types without a template may be given; they reach their dependents
+        through `sources`.
+        """
+        dependents = self.dependents()
+        for node, upstream in self.sources.items():
+            for source in upstream:
+                dependents.setdefault(source, set()).add(node)
+        pending = [_type_name(artifact_type) for artifact_type in artifact_types]
+        reached = set()
+        while pending:
+            node = pending.pop()
+            if node in reached:
+                continue
+            reached.add(node)
+            pending.extend(dependents.get(node, ()))
+        return reached
+
+    def topological_order(self) -> List[str]:
+        """
+        Order the types so each comes after everything it depends on.
+
+        Raises:
+            ValueError: If the templates' dependencies form a cycle
+        """
+        remaining = {node: len(upstream) for node, upstream in self.dependencies.items()}
+        dependents = self.dependents()
+        ready = sorted(node for node, count in remaining.items() if count == 0)
+        order = []
+        while ready:
+            node = ready.pop(0)
+            order.append(node)
+            for dependent in sorted(dependents[node]):
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+
+        if len(order) != len(self.dependencies):
+            cycle = sorted(node for node in self.dependencies if node not in order)
+            raise ValueError(f"Prompt template dependencies form a cycle; unresolved types: {cycle}")
+        return order
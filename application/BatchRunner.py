@@ -0,0 +1,288 @@
+import os
+import json
+import time
+import logging
+import argparse
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from application.queries import GetPromptTemplateQuery
+from application.ArtifactGraph import ArtifactGraph
+from domain.value_objects.artifact_type import ArtifactType
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks for prompts completed by running workers
+PROGRESS_POLL = 1.0
+
+
+class CheckpointJournal:
+    """
+    Append-only JSONL journal of completed work units.
+
+    A unit is (project, artifact_type, prompt_id); a prompt_id of None marks
+    the whole artifact type as done for the project. Each record is flushed
+    and fsynced before record() returns, so after a crash the journal holds
+    exactly the units that finished. A torn last line is ignored on load.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open the journal, loading the units recorded by previous runs.
+
+        Args:
+            path: Journal file, created if missing
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._done: Set[Tuple[str, str]] = set()
+        self._prompts: Dict[Tuple[str, str], Set[str]] = {}
+
+        if os.path.exists(path):
+            valid_end = 0
+            with open(path, 'rb') as file:
+                for line in file:
+                    if not line.endswith(b'\n'):
+                        break
+                    record = json.loads(line)
+                    self._add(record['project'], record['artifact_type'], record.get('prompt_id'))
+                    valid_end += len(line)
+            # Drop a torn record left by a crash mid-write before appending
+            if os.path.getsize(path) != valid_end:
+                os.truncate(path, valid_end)
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._file = open(path, 'a')
+
+    def _add(self, project: str, artifact_type: str, prompt_id: Optional[str]) -> None:
+        if prompt_id is None:
+            self._done.add((project, artifact_type))
+        else:
+            self._prompts.setdefault((project, artifact_type), set()).add(prompt_id)
+
+    def __contains__(self, unit: Tuple[str, str, Optional[str]]) -> bool:
+        project, artifact_type, prompt_id = unit
+        if prompt_id is None:
+            return (project, artifact_type) in self._done
+        return prompt_id in self._prompts.get((project, artifact_type), ())
+
+    def prompt_ids(self, project: str, artifact_type: str) -> Set[str]:
+        """
+        Prompt ids recorded as completed for a project's artifact type.
+        """
+        return set(self._prompts.get((project, artifact_type), ()))
+
+    def record(self, project: str, artifact_type: str, prompt_ids: List[Optional[str]]) -> None:
+        """
+        Durably record completed units.
+        """
+        with self._lock:
+            for prompt_id in prompt_ids:
+                record = {'project': project, 'artifact_type': artifact_type, 'prompt_id': prompt_id}
+                self._file.write(json.dumps(record, separators=(',', ':')) + '\n')
+                self._add(project, artifact_type, prompt_id)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+def _generate(
+    project: str,
+    artifact_type: str,
+    skip_ids: Set[str],
+    options: Dict[str, Any],
+    progress: Optional[Any] = None
+) -> List[str]:
+    """
+    Generate one artifact type for one project; runs in a worker process.
+
+    Ids of prompts are put on the progress queue, as (project, artifact_type,
+    prompt_ids), as soon as their content is persisted.
+    """
+    def on_stored(prompt_ids: List[str]) -> None:
+        progress.put((project, artifact_type, prompt_ids))
+
+    from application.ContextSelector import ContextSelector
+    from application.GenerateArtifactContent import ArtifactContentService
+    from infrastructure.external_services.service_factory import create_service_integrator, get_service_config
+
+    options = dict(options)
+    service_name = options.pop('service_name', None)
+    integrator = create_service_integrator(service_name) if service_name else None
+    if service_name and 'context_selector' not in options:
+        # Size context to the provider's configured budget
+        options['context_selector'] = ContextSelector.from_config(get_service_config(service_name))
+    try:
+        service = ArtifactContentService(project_name=project, service_integrator=integrator, **options)
+        return service.generate_artifact_content(
+            ArtifactType(artifact_type), skip_ids=skip_ids,
+            on_stored=on_stored if progress is not None else None
+        )
+    finally:
+        if integrator is not None:
+            integrator.close()
+
+
+class BatchRunner:
+    """
+    Runs ArtifactContentService for many projects across a process pool.
+
+    Projects run in parallel; within a project, artifact types run one after
+    another in template dependency order. Completed units are checkpointed
+    to a CheckpointJournal, so a rerun with the same journal resumes where
+    the previous one stopped: finished types are skipped, and prompts of a
+    partly finished type are not sent again. Workers report each prompt as
+    soon as its content is persisted, so prompts finished by a task that
+    later fails (or a run that is interrupted) are journaled too.
+    """
+
+    def __init__(
+        self,
+        projects: List[str],
+        artifact_types: Optional[List[ArtifactType]],
+        journal_path: str,
+        max_workers: Optional[int] = None,
+        service_options: Optional[Dict[str, Any]] = None,
+        report_interval: float = 10.0
+    ):
+        """
+        Args:
+            projects: Names of the projects to generate
+            artifact_types: Types to generate (every type with a template when None)
+            journal_path: Checkpoint journal file
+            max_workers: Worker processes (CPU count when None)
+            service_options: Picklable ArtifactContentService options, plus an
+                             optional 'service_name' to build an integrator from config
+            report_interval: Minimum seconds between progress reports
+        """
+        self.projects = projects
+        self.artifact_types = artifact_types
+        self.journal_path = journal_path
+        self.max_workers = max_workers
+        self.service_options = service_options or {}
+        self.report_interval = report_interval
+
+    def _plan(self) -> List[str]:
+        graph = ArtifactGraph.from_templates(GetPromptTemplateQuery().execute())
+        if self.artifact_types is not None:
+            graph = graph.subgraph(self.artifact_types)
+        return graph.topological_order()
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Generate every pending (project, artifact type) pair.
+
+        Returns:
+            Dict[str, Any]: Counts of completed, skipped (already journaled), failed and
+                            blocked (downstream of a failure) tasks, and generated prompts
+        """
+        order = self._plan()
+        journal = CheckpointJournal(self.journal_path)
+        queues = {
+            project: [node for node in order if (project, node, None) not in journal]
+            for project in self.projects
+        }
+        total = sum(len(queue) for queue in queues.values())
+        stats = {
+            'tasks': total,
+            'skipped': len(self.projects) * len(order) - total,
+            'completed': 0,
+            'failed': 0,
+            'blocked': 0,
+            'prompts': 0
+        }
+        started = last_report = time.monotonic()
+
+        manager = multiprocessing.Manager()
+        progress = manager.Queue()
+
+        def record_progress() -> None:
+            while not progress.empty():
+                project, artifact_type, prompt_ids = progress.get()
+                journal.record(project, artifact_type, prompt_ids)
+                stats['prompts'] += len(prompt_ids)
+
+        try:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                def submit(project: str):
+                    artifact_type = queues[project].pop(0)
+                    future = executor.submit(
+                        _generate, project, artifact_type,
+                        journal.prompt_ids(project, artifact_type), self.service_options, progress
+                    )
+                    return future, (project, artifact_type)
+
+                running = dict(submit(project) for project in self.projects if queues[project])
+                while running:
+                    done, _ = wait(running, timeout=PROGRESS_POLL, return_when=FIRST_COMPLETED)
+                    # Workers report before returning, so a finished task's prompts are all queued
+                    record_progress()
+                    for future in done:
+                        project, artifact_type = running.pop(future)
+                        error = future.exception()
+                        if error is not None:
+                            # Downstream types need this one, so the project stops here
+                            logger.error(f"{project}/{artifact_type} failed: {error}")
+                            stats['failed'] += 1
+                            stats['blocked'] += len(queues[project])
+                            queues[project].clear()
+                            continue
+
+                        journal.record(project, artifact_type, [None])
+                        stats['completed'] += 1
+                        if queues[project]:
+                            next_future, task = submit(project)
+                            running[next_future] = task
+
+                    now = time.monotonic()
+                    if now - last_report >= self.report_interval or not running:
+                        last_report = now
+                        self._report(stats, now - started)
+        finally:
+            record_progress()
+            journal.close()
+            manager.shutdown()
+        return stats
+
+    @staticmethod
+    def _report(stats: Dict[str, Any], elapsed: float) -> None:
+        finished = stats['completed'] + stats['failed']
+        rate = finished / elapsed if elapsed else 0.0
+        remaining = stats['tasks'] - finished - stats['blocked']
+        eta = remaining / rate if rate else float('inf')
+        logger.info(
+            f"{finished}/{stats['tasks']} tasks ({stats['failed']} failed), "
+            f"{stats['prompts'] / elapsed if elapsed else 0.0:.1f} prompts/s, "
+            f"{rate * 60:.1f} tasks/min, ETA {eta:.0f}s"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate artifacts for many projects, resumably.")
+    parser.add_argument('projects', nargs='+', help="Project names")
+    parser.add_argument('--types', nargs='*', help="Artifact types (all with a template by default)")
+    parser.add_argument('--journal', default='batch_journal.jsonl', help="Checkpoint journal file")
+    parser.add_argument('--workers', type=int, help="Worker processes")
+    parser.add_argument('--service', help="Service to generate with, from config.json")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    runner = BatchRunner(
+        projects=args.projects,
+        artifact_types=[ArtifactType(name) for name in args.types] if args.types else None,
+        journal_path=args.journal,
+        max_workers=args.workers,
+        service_options={'service_name': args.service} if args.service else None
+    )
+    stats = runner.run()
+    logger.info(f"Done: {stats}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from application.PromptDeduplicator import BOOKKEEPING_FIELDS
+from infrastructure.external_services.rate_limiter import estimate_tokens
+from infrastructure.repositories.text_index import InvertedIndex
+
+
+def _content(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in item.items() if key not in BOOKKEEPING_FIELDS}
+
+
+def _shrink(value: Any, ratio: float) -> Any:
+    """
+    Cut every string nested in a value to the given fraction of its length.
+    """
+    if isinstance(value, str):
+        return value[:int(len(value) * ratio)]
+    if isinstance(value, dict):
+        return {key: _shrink(nested, ratio) for key, nested in value.items()}
+    if isinstance(value, list):
+        return [_shrink(nested, ratio) for nested in value]
+    return value
+
+
+@dataclass
+class ContextSelector:
+    """
+    Selection stage between GetContextQuery and prompt creation.
+
+    Each context item becomes its own prompt, so the token budget applies to
+    every item on its own: an item over budget has its text truncated to fit
+    rather than being left out. Items are ranked against the template's
+    subject, description and instructions with BM25 over their content
+    fields; with max_items, only the most relevant ones get a prompt.
+    """
+    token_budget: int = 8000
+    max_items: Optional[int] = None
+    k1: float = 1.2
+    b: float = 0.75
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'ContextSelector':
+        """
+        Build a selector from a provider's config block, e.g.
+        {"context_token_budget": 8000, "context_max_items": 50}.
+        """
+        return cls(
+            token_budget=config.get('context_token_budget', cls.token_budget),
+            max_items=config.get('context_max_items')
+        )
+
+    @staticmethod
+    def _query_text(template: Any) -> str:
+        fields = ('subject', 'description', 'instructions')
+        if isinstance(template, dict):
+            return " ".join(str(template.get(field) or "") for field in fields)
+        return " ".join(str(getattr(template, field, "") or "") for field in fields)
+
+    def rank(self, query: str, items: List[Dict]) -> List[int]:
+        """
+        Order items by BM25 relevance of their content fields to a query.
+
+        Args:
+            query: Free-text query
+            items: Context items
+
+        Returns:
+            List[int]: Item positions, best first; items matching no query
+                       term follow in their given order
+        """
+        index = InvertedIndex(k1=self.k1, b=self.b)
+        for position, item in enumerate(items):
+            index.add(str(position), _content(item))
+        matched = [int(key) for key, _ in index.search(query, top_k=None)]
+        seen = set(matched)
+        return matched + [position for position in range(len(items)) if position not in seen]
+
+    def fit(self, item: Dict) -> Dict:
+        """
+        Truncate an item's content so it fits in the token budget.
+
+        Every string in its content fields is cut by the same fraction; the
+        bookkeeping fields (id, type, content hash, ...) are kept whole.
+
+        Args:
+            item: Context item
+
+        Returns:
+            Dict: The item itself if it fits, otherwise a truncated copy
+        """
+        cost = estimate_tokens(item)
+        if cost <= self.token_budget:
+            return item
+
+        fitted = dict(item)
+        # Key names and bookkeeping fields don't shrink, so a few passes may be needed
+        for _ in range(3):
+            fitted.update(_shrink(_content(fitted), self.token_budget / cost))
+            cost = estimate_tokens(fitted)
+            if cost <= self.token_budget:
+                break
+        return fitted
+
+    def select(self, template: Any, items: List[Dict]) -> List[Dict]:
+        """
+        Pick the most relevant items, each fitted to the token budget.
+
+        Args:
+            template: PromptTemplate (or its dict) the context is for
+            items: Candidate context items
+
+        Returns:
+            List[Dict]: Selected items, most relevant first
+        """
+        return self.partition(template, items)[0]
+
+    def partition(self, template: Any, items: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """
+        Split items into those selected, fitted to the token budget, and
+        those left out by max_items.
+
+        Args:
+            template: PromptTemplate (or its dict) the context is for
+            items: Candidate context items
+
+        Returns:
+            Selected items, most relevant first, and dropped items in their given order
+        """
+        if not items:
+            return [], []
+
+        order = self.rank(self._query_text(template), items)
+        kept = order if self.max_items is None else order[:self.max_items]
+        selected = [self.fit(items[position]) for position in kept]
+        kept = set(kept)
+        dropped = [item for position, item in enumerate(items) if position not in kept]
+        return selected, dropped
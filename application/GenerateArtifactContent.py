@@ -1,8 +1,12 @@
 # application/services/artifact_app_service.py
-from dataclasses import dataclass
-from typing import Dict, Any, List
+import io
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, asdict, field
+from typing import Callable, Dict, Any, Iterable, List, Optional, Tuple
 
-from application.queries import GetPromptTemplateQuery, GetContextQuery
+from application.queries import GetPromptTemplateQuery
 from application.commands import (
     GetContextCommand, 
     GeneratePromptCommand, 
@@ -11,7 +15,15 @@ from application.commands import (
 
 from domain.Artifact import Artifact
 from domain.value_objects.artifact_type import ArtifactType
+from domain.value_objects.Fingerprint import fingerprint
 from infrastructure.repositories.stores import create_content_store
+from infrastructure.external_services.service_integrator import ServiceIntegrator, chunk_text
+from infrastructure.external_services.batch_client import BatchClient
+from application.ContextSelector import ContextSelector
+from application.ArtifactGraph import ArtifactGraph
+from application.PromptDeduplicator import PromptDeduplicator, context_text
+
+logger = logging.getLogger(__name__)
 
 @dataclass
 class ArtifactContentService:
@@ -19,16 +31,45 @@ class ArtifactContentService:
     App service for generating and updating artifact content for a specific project.
     """
     project_name: str
+    service_integrator: Optional[ServiceIntegrator] = None
+    endpoint: str = "chat/completions"
+    max_concurrency: int = 10
+    stream: bool = False
+    batch_client: Optional[BatchClient] = None
+    context_selector: Optional[ContextSelector] = None
+    model_params: Dict[str, Any] = field(default_factory=dict)
+    deduplicator: Optional[PromptDeduplicator] = None
+    # Characters of a streamed completion received between partial saves
+    stream_flush_size: int = 4096
     
-    def generate_artifact_content(self, artifact_type: ArtifactType) -> None:
+    def generate_artifact_content(
+        self,
+        artifact_type: ArtifactType,
+        force: bool = False,
+        skip_ids: Iterable[str] = (),
+        on_stored: Optional[Callable[[List[str]], None]] = None,
+        on_dropped: Optional[Callable[[List[str]], None]] = None
+    ) -> List[str]:
         """
         Orchestrate the process of generating artifact content for a specific project.
 
+        Content is only generated for prompts whose fingerprint (template,
+        upstream content hash and model parameters) differs from the one
+        stored with the existing content. With a deduplicator, exact and
+        near-duplicate prompts are sent once and the response is stored for
+        every prompt in the group (streamed prompts are sent individually).
+
         Args:
             artifact_type: Type of artifact to generate
+            force: Regenerate every prompt, even if its inputs are unchanged
+            skip_ids: Prompt ids already generated, e.g. recorded by a batch run's journal
+            on_stored: Called with the ids of each group of prompts as soon as their
+                       content is persisted, before later prompts are sent
+            on_dropped: Called with the ids of context items the context selector
+                        left out (beyond its max_items); no content is generated for them
         
         Returns:
-            None
+            List[str]: Ids of the prompts whose content was generated and stored
         """
         # Create project-specific content store
         content_store = create_content_store(self.project_name)
@@ -51,22 +92,278 @@ class ArtifactContentService:
             content_store=content_store
         )
 
-        # Get context
-        get_context_query = GetContextQuery(artifact_type=artifact_type)
-        contexts = get_context_query.execute()
+        # Skip prompts whose inputs haven't changed since their content was generated
+        params = {"endpoint": self.endpoint, **self.model_params}
+        skip_ids = set(skip_ids)
+        stored = {} if force else {
+            item.get("id"): item.get("fingerprint")
+            for item in content_store.iter_find_by(
+                {"type": artifact.type.value}, fields=["id", "fingerprint"]
+            )
+        }
+        fingerprints = {}
+
+        def report_dropped(items: List[Dict]) -> None:
+            dropped_ids = [item.get("id") for item in items]
+            logger.warning(
+                f"{artifact.type.value}: {len(dropped_ids)} context items are beyond the "
+                f"selector's max_items and get no prompt: {dropped_ids}"
+            )
+            if on_dropped:
+                on_dropped(dropped_ids)
+
+        def pending_prompts():
+            # Prompts are built lazily, each one rendered just before it is sent
+            for prompt in artifact.iter_prompts(
+                template, selector=self.context_selector, on_dropped=report_dropped
+            ):
+                if prompt.id in skip_ids:
+                    continue
+                fingerprints[prompt.id] = fingerprint(prompt.template, prompt.context, params)
+                if force or stored.get(prompt.id) != fingerprints[prompt.id]:
+                    yield prompt
+
+        prompts = pending_prompts()
+
+        if self.batch_client:
+            # Submit every prompt as one provider batch and map results back by id;
+            # payloads are rendered as the batch file is written
+            prompts, members = self._deduplicate(prompts)
+            results = self.batch_client.run((prompt.id, self._payload(prompt)) for prompt in prompts)
+            content = [
+                self._content_item(member, body, fingerprints[member.id])
+                for prompt_id, body in results.items()
+                for member in members[prompt_id]
+            ]
+            if not content:
+                return []
+            UpdateContentCommand(artifact=artifact, content=content).execute()
+            generated = [item["id"] for item in content]
+            if on_stored:
+                on_stored(generated)
+            return generated
+
+        if self.service_integrator and self.stream:
+            # Persist each completion incrementally as its chunks arrive
+            generated = []
+            for prompt in prompts:
+                self._stream_content(artifact, prompt, fingerprints[prompt.id])
+                generated.append(prompt.id)
+                if on_stored:
+                    on_stored([prompt.id])
+            return generated
 
-        # Generate prompts
-        prompts = artifact.create_prompt(template)
+        prompts, members = self._deduplicate(prompts)
 
-        # Here you would typically integrate with an LLM or content generation service
-        # For now, we'll simulate content generation
-        generated_content = [
-            {"id": prompt.id, "content": f"Generated content for {prompt.template}"} 
-            for prompt in prompts
-        ]
+        if self.service_integrator:
+            # Fan prompts out concurrently, bounded by max_concurrency; each one
+            # is pulled and rendered only when a slot frees up
+            responses = asyncio.run(self.service_integrator.gather_requests(
+                self.endpoint,
+                (self._payload(prompt) for prompt in prompts),
+                max_concurrency=self.max_concurrency,
+                return_exceptions=True
+            ))
+            failures = [response for response in responses if isinstance(response, Exception)]
+            # members lists representatives in the order they were sent
+            generated_content = [
+                self._content_item(member, response['data'], fingerprints[member.id])
+                for prompt_id, response in zip(members, responses)
+                if not isinstance(response, Exception)
+                for member in members[prompt_id]
+            ]
+        else:
+            # Without a service, simulate content generation
+            failures = []
+            generated_content = [
+                self._content_item(member, f"Generated content for {prompt.template}", fingerprints[member.id])
+                for prompt in prompts
+                for member in members[prompt.id]
+            ]
 
         # Update content
         artifact.update_content(generated_content)
+        generated = [item["id"] for item in generated_content]
+        if on_stored and generated:
+            on_stored(generated)
+
+        if failures:
+            # Successful responses are persisted (and cached), so a re-run
+            # only goes back to the network for the failed prompts
+            raise failures[0]
+        return generated
+
+    def generate_all(
+        self,
+        artifact_types: Optional[List[ArtifactType]] = None,
+        max_workers: Optional[int] = None
+    ) -> List[ArtifactType]:
+        """
+        Generate several artifact types, following the dependencies between
+        their prompt templates.
+
+        Each type starts as soon as every type it uses as context has been
+        generated and persisted, and independent types run concurrently, so
+        the total time is the graph's critical path rather than the sum.
+        When a type fails, the types depending on it are not started.
+
+        Args:
+            artifact_types: Types to generate (every type with a template when None)
+            max_workers: Types generated at once (all ready types when None)
+
+        Returns:
+            List[ArtifactType]: Generated types, in completion order
+
+        Raises:
+            ValueError: If the template dependencies form a cycle
+        """
+        graph = ArtifactGraph.from_templates(GetPromptTemplateQuery().execute())
+        if artifact_types is not None:
+            graph = graph.subgraph(artifact_types)
+        # Reject cycles before generating anything
+        graph.topological_order()
+
+        dependents = graph.dependents()
+        waiting = {node: len(upstream) for node, upstream in graph.dependencies.items()}
+        completed, failures = [], []
+
+        with ThreadPoolExecutor(max_workers=max_workers or max(len(waiting), 1)) as executor:
+            def start(node: str):
+                return executor.submit(self.generate_artifact_content, ArtifactType(node))
+
+            running = {start(node): node for node, count in waiting.items() if count == 0}
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node = running.pop(future)
+                    if future.exception() is not None:
+                        failures.append(future.exception())
+                        continue
+                    completed.append(ArtifactType(node))
+                    for dependent in dependents[node]:
+                        waiting[dependent] -= 1
+                        if waiting[dependent] == 0:
+                            running[start(dependent)] = dependent
+
+        if failures:
+            raise failures[0]
+        return completed
+
+    def regenerate(self, changed_types: List[ArtifactType], max_workers: Optional[int] = None) -> List[ArtifactType]:
+        """
+        Bring content up to date after the given types changed, e.g. after
+        Project.initialize_with_questionnaire stored new answers.
+
+        Only the changed types and the types downstream of them in the
+        template graph are visited, and within those only prompts whose
+        inputs changed are sent.
+
+        Args:
+            changed_types: Types whose content changed
+            max_workers: Types generated at once (all ready types when None)
+
+        Returns:
+            List[ArtifactType]: Visited types, in completion order
+        """
+        graph = ArtifactGraph.from_templates(GetPromptTemplateQuery().execute())
+        # Changed types without a template (e.g. the questionnaire) aren't
+        # generated themselves, but their dependents are
+        affected = graph.downstream(changed_types) & set(graph.dependencies)
+        return self.generate_all(
+            [ArtifactType(node) for node in affected], max_workers=max_workers
+        )
+
+    def _deduplicate(self, prompts: Iterable) -> Tuple[Iterable, Dict[str, List]]:
+        """
+        Collapse exact and near-duplicate prompts to one representative each.
+
+        Without a deduplicator prompts pass through lazily, and each one's
+        entry in the members map is added as it is consumed; grouping needs
+        every prompt, so with one they are read up front.
+
+        Args:
+            prompts: Prompts about to be sent
+
+        Returns:
+            Representatives to send, and the prompts (representative included)
+            whose content each representative's response provides, by its id,
+            in the order the representatives are sent
+        """
+        if self.deduplicator is None:
+            members = {}
+
+            def each_alone():
+                for prompt in prompts:
+                    members[prompt.id] = [prompt]
+                    yield prompt
+
+            return each_alone(), members
+
+        prompts = list(prompts)
+        if len(prompts) < 2:
+            return prompts, {prompt.id: [prompt] for prompt in prompts}
+
+        # All prompts here share one template, so only their context tells them apart
+        texts = [context_text(prompt.context) for prompt in prompts]
+        groups = self.deduplicator.group(texts)
+        representatives = [prompts[group[0]] for group in groups]
+        members = {prompts[group[0]].id: [prompts[index] for index in group] for group in groups}
+        return representatives, members
+
+    @staticmethod
+    def _content_item(prompt, content: Any, prompt_fingerprint: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Content item generated for a prompt: stored under the prompt's own id,
+        with the id of the context item it was generated from as source_id.
+        """
+        item = {"id": prompt.id, "source_id": prompt.context.get("id"), "content": content}
+        if prompt_fingerprint is not None:
+            item["fingerprint"] = prompt_fingerprint
+        return item
+
+    def _payload(self, prompt) -> Dict[str, Any]:
+        if prompt.payload is not None:
+            return {**prompt.payload, **self.model_params}
+        return {**asdict(prompt), **self.model_params}
+
+    def _stream_content(self, artifact: Artifact, prompt, prompt_fingerprint: str) -> None:
+        """
+        Stream a single prompt's completion into the content store.
+
+        The partial completion is saved each time another stream_flush_size
+        characters have arrived, rather than on every delta, and the whole
+        item once at the end.
+
+        Args:
+            artifact: Artifact receiving the content
+            prompt: Prompt to send
+            prompt_fingerprint: Fingerprint stored once the completion is whole
+        """
+        completion = io.StringIO()
+        unsaved = 0
+        chunks = self.service_integrator.stream_request(
+            self.endpoint,
+            json={**self._payload(prompt), "stream": True}
+        )
+        for chunk in chunks:
+            text = chunk_text(chunk)
+            if not text:
+                continue
+            completion.write(text)
+            unsaved += len(text)
+            if unsaved >= self.stream_flush_size:
+                unsaved = 0
+                UpdateContentCommand(
+                    artifact=artifact,
+                    content=[self._content_item(prompt, completion.getvalue())]
+                ).execute()
+
+        # Record the fingerprint only once the completion is whole, so an
+        # interrupted stream is generated again on the next run
+        UpdateContentCommand(
+            artifact=artifact,
+            content=[self._content_item(prompt, completion.getvalue(), prompt_fingerprint)]
+        ).execute()
 
 
 # ----
@@ -0,0 +1,136 @@
+import json
+import re
+import zlib
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"\w+")
+# Mersenne prime for the MinHash permutations; hashes are reduced below it
+# so products of two values stay within uint64
+PRIME = (1 << 31) - 1
+# Store bookkeeping on a context item; items differing only here are duplicates
+BOOKKEEPING_FIELDS = ('id', 'source_id', 'type', 'project_id', 'content_hash', 'fingerprint')
+
+
+def context_text(context: Dict[str, Any]) -> str:
+    """
+    Text to compare prompts built from one template by: their context item,
+    without its bookkeeping fields.
+
+    Prompts of one template share the template's text, which would dominate
+    the shingles of the whole payload and make every pair look similar.
+    """
+    varying = {key: value for key, value in context.items() if key not in BOOKKEEPING_FIELDS}
+    return json.dumps(varying, sort_keys=True, default=str)
+
+
+@dataclass
+class PromptDeduplicator:
+    """
+    Dedup stage before dispatch: groups exact and near-duplicate prompts so
+    only one representative per group is sent. Prompts of one template are
+    compared by their context_text.
+
+    Near duplicates are found with MinHash signatures over word shingles,
+    bucketed with LSH bands so only prompts sharing a band are compared;
+    candidate pairs whose estimated Jaccard similarity reaches threshold are
+    merged into one group.
+    """
+    threshold: float = 0.9
+    num_perm: int = 128
+    shingle_size: int = 5
+    seed: int = 1
+
+    def __post_init__(self):
+        if not 0.0 < self.threshold <= 1.0:
+            raise ValueError(f"Similarity threshold must be in (0, 1], got {self.threshold}")
+        rng = np.random.default_rng(self.seed)
+        self._coefficients = (
+            rng.integers(1, PRIME, size=self.num_perm, dtype=np.uint64),
+            rng.integers(0, PRIME, size=self.num_perm, dtype=np.uint64)
+        )
+        self.bands, self.rows = self._band_layout()
+
+    def _band_layout(self) -> Tuple[int, int]:
+        """
+        Pick bands x rows so the LSH collision curve's threshold,
+        (1 / bands) ** (1 / rows), is closest to the similarity threshold.
+        """
+        layouts = [
+            (bands, self.num_perm // bands)
+            for bands in range(1, self.num_perm + 1) if self.num_perm % bands == 0
+        ]
+        return min(layouts, key=lambda layout: abs((1 / layout[0]) ** (1 / layout[1]) - self.threshold))
+
+    def _shingles(self, text: str) -> np.ndarray:
+        tokens = TOKEN_PATTERN.findall(text.lower())
+        size = min(self.shingle_size, len(tokens)) or 1
+        shingles = {' '.join(tokens[i:i + size]) for i in range(max(len(tokens) - size + 1, 1))}
+        return np.array([zlib.crc32(shingle.encode('utf-8')) % PRIME for shingle in shingles], dtype=np.uint64)
+
+    def signature(self, text: str) -> np.ndarray:
+        """
+        MinHash signature of a text's word shingles.
+        """
+        a, b = self._coefficients
+        hashes = self._shingles(text)
+        return ((np.outer(a, hashes) + b[:, None]) % PRIME).min(axis=1)
+
+    def group(self, texts: List[str]) -> List[List[int]]:
+        """
+        Group exact and near-duplicate texts.
+
+        Args:
+            texts: Texts to compare, e.g. context_text of each prompt's context
+
+        Returns:
+            List[List[int]]: Groups of indices into texts, each in input order;
+                             the first index of a group is its representative
+        """
+        parent = list(range(len(texts)))
+
+        def find(index: int) -> int:
+            while parent[index] != index:
+                parent[index] = parent[parent[index]]
+                index = parent[index]
+            return index
+
+        def union(first: int, second: int) -> None:
+            first, second = find(first), find(second)
+            if first != second:
+                parent[max(first, second)] = min(first, second)
+
+        # Exact duplicates need no signature
+        unique: Dict[str, int] = {}
+        for index, text in enumerate(texts):
+            if text in unique:
+                union(unique[text], index)
+            else:
+                unique[text] = index
+
+        if self.threshold < 1.0 and len(unique) > 1:
+            indices = list(unique.values())
+            signatures = np.stack([self.signature(texts[index]) for index in indices])
+            buckets: Dict[Tuple[int, bytes], List[int]] = {}
+            for band in range(self.bands):
+                rows = signatures[:, band * self.rows:(band + 1) * self.rows]
+                for position, row in enumerate(rows):
+                    buckets.setdefault((band, row.tobytes()), []).append(position)
+
+            compared = set()
+            for members in buckets.values():
+                for i, first in enumerate(members):
+                    for second in members[i + 1:]:
+                        if (first, second) in compared:
+                            continue
+                        compared.add((first, second))
+                        similarity = np.mean(signatures[first] == signatures[second])
+                        if similarity >= self.threshold:
+                            union(indices[first], indices[second])
+
+        groups: Dict[int, List[int]] = {}
+        for index in range(len(texts)):
+            groups.setdefault(find(index), []).append(index)
+        return list(groups.values())
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional
 from infrastructure.repositories import content_store
 
 
@@ -26,4 +26,21 @@ class GetContextQuery:
         criteria_with_type = self.criteria.copy()
         criteria_with_type["type"] = self.artifact_type
         
-        return content_store.find_by(criteria_with_type)
\ No newline at end of file
+        return content_store.find_by(criteria_with_type)
+
+    def iterate(self, limit: Optional[int] = None, offset: int = 0) -> Iterator[Dict]:
+        """
+        Stream context items instead of building the full list, so callers
+        can stop early and memory stays flat on large projects.
+
+        Args:
+            limit: Maximum number of items to yield
+            offset: Number of items to skip first
+
+        Returns:
+            Iterator[Dict]: Retrieved context items
+        """
+        criteria_with_type = dict(self.criteria or {})
+        criteria_with_type["type"] = self.artifact_type
+
+        return content_store.iter_find_by(criteria_with_type, limit=limit, offset=offset)
@@ -0,0 +1,28 @@
+from dataclasses import dataclass
+from typing import List, Dict, Optional
+from infrastructure.repositories import content_store
+
+
+@dataclass
+class SearchContextQuery:
+    """
+    Query to retrieve the context items most relevant to a free-text query,
+    e.g. "the user stories mentioning payments".
+    """
+    text: str
+    artifact_type: Optional[str] = None
+    filters: Optional[Dict] = None
+    top_k: Optional[int] = 10
+
+    def execute(self) -> List[Dict]:
+        """
+        Execute the query against the content store's full-text index.
+
+        Returns:
+            List[Dict]: Matching context items, most relevant first
+        """
+        criteria = dict(self.filters or {})
+        if self.artifact_type:
+            criteria["type"] = self.artifact_type
+
+        return content_store.search(self.text, criteria, self.top_k)
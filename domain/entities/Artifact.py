@@ -1,10 +1,12 @@
 from dataclasses import dataclass
-from typing import List, Dict
+from typing import Callable, Iterable, Iterator, List, Dict, Optional
 import uuid
 
 from domain.value_objects.artifact_type import ArtifactType
 from domain.value_objects.prompt_template import PromptTemplate
 from domain.value_objects.prompt import Prompt
+from domain.value_objects.Fingerprint import content_hash
+from domain.value_objects.CompiledTemplate import compile_template
 from infrastructure.repositories.stores import content_store  # Use this directly
 
 @dataclass
@@ -20,28 +22,75 @@ class Artifact:
         self.type = type
         self.content_store = content_store
 
-    def create_prompt(self, template: PromptTemplate) -> List[Prompt]:
+    def create_prompt(self, template: PromptTemplate, selector: Optional[object] = None) -> List[Prompt]:
         from application.queries.artifact_queries import get_context  # Dynamic import for queries
         contexts = get_context(self.content_store, template)
+        return list(self.iter_prompts(template, contexts, selector))
 
-        prompts = []
-        template_dict = template.__dict__.copy()
-        del template_dict['objects']  # Remove objects field
+    def iter_prompts(
+        self,
+        template: PromptTemplate,
+        contexts: Optional[Iterable[Dict]] = None,
+        selector: Optional[object] = None,
+        on_dropped: Optional[Callable[[List[Dict]], None]] = None
+    ) -> Iterator[Prompt]:
+        """
+        Lazily build one prompt per context item, rendering the compiled
+        template as each item is reached, so prompts can be sent while later
+        ones are still being built and memory stays flat.
+
+        Each prompt's id is "<artifact type>:<context item id>", the id its
+        generated content is stored under.
+
+        Args:
+            template: Prompt template (or its stored dict)
+            contexts: Context items (streamed from the content store for the
+                      template's objects when None)
+            selector: Optional ContextSelector; it ranks the whole set, so
+                      selection materializes the items first
+            on_dropped: Called with the context items the selector left out,
+                        which get no prompt
+
+        Returns:
+            Iterator[Prompt]: Prompts in context order
+        """
+        template_dict = dict(template) if isinstance(template, dict) else template.__dict__.copy()
+        template_dict.pop('objects', None)  # Remove objects field
+        compiled = compile_template(template_dict)
+
+        if contexts is None:
+            objects = (template.get('objects') or []) if isinstance(template, dict) else template.objects
+            contexts = (
+                item
+                for artifact_type in objects
+                for item in self.content_store.iter_find_by({'type': getattr(artifact_type, 'value', artifact_type)})
+            )
+        if selector is not None:
+            # Keep the most relevant context, each item fitted to the token budget
+            contexts, dropped = selector.partition(template, list(contexts))
+            if dropped and on_dropped:
+                on_dropped(dropped)
 
         for context_item in contexts:
-            prompt = Prompt(
+            # Generated content gets its own id; keying it on the context item's
+            # id would overwrite the upstream item in a shared store
+            yield Prompt(
                 template=template_dict,
-                context=context_item
+                context=context_item,
+                id=f"{self.type.value}:{context_item.get('id')}",
+                payload=compiled.render(context_item) if compiled.placeholders else None
             )
-            prompts.append(prompt)
-
-        return prompts
 
     def update_content(self, content: List[Dict]) -> None:
         """
-        Updates artifact content in storage.
+        Updates artifact content in storage, recording each item's content hash
+        so downstream prompts built from unchanged items can be skipped.
 
         Args:
             content: New content list to store
         """
-        self.content_store.update(self.type, content)
+        items = [
+            {**item, 'type': self.type.value, 'project_id': self.project_id}
+            for item in content
+        ]
+        self.content_store.save_many([{**item, 'content_hash': content_hash(item)} for item in items])
@@ -19,8 +19,11 @@ class Project:
         Args:
             questionnaire_content: The completed questionnaire
         """
-        # Store questionnaire content as a single-item list
-        self.content_store.update(
-            ArtifactType.QUESTIONNAIRE, 
-            [questionnaire_content]
-        )
\ No newline at end of file
+        # Store questionnaire content as a single-item list under a stable id;
+        # its content hash lets ArtifactContentService.regenerate() skip
+        # downstream content that doesn't depend on what changed
+        Artifact(
+            project_id=self.id,
+            type=ArtifactType.QUESTIONNAIRE,
+            content_store=self.content_store
+        ).update_content([{'id': f"{self.name}-questionnaire", **questionnaire_content}])
\ No newline at end of file
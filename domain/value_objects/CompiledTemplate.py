@@ -0,0 +1,162 @@
+import json
+import threading
+from collections import OrderedDict
+from string import Formatter
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+# A compiled string: literal text interleaved with placeholder paths
+Parts = Tuple[Union[str, Tuple[str, ...]], ...]
+
+_MISSING = object()
+
+
+def _compile_string(text: str) -> Union[str, Parts]:
+    """
+    Split a string into literals and {placeholder} paths. Strings without
+    placeholders, or with braces that aren't valid placeholders (e.g. JSON
+    examples), stay as plain literals.
+    """
+    try:
+        parsed = list(Formatter().parse(text))
+    except ValueError:
+        return text
+
+    parts: List[Union[str, Tuple[str, ...]]] = []
+    for literal, name, _, _ in parsed:
+        if literal:
+            parts.append(literal)
+        if name is not None:
+            if not name or not all(segment.isidentifier() or segment.isdigit() for segment in name.split('.')):
+                return text
+            parts.append(tuple(name.split('.')))
+    if not any(isinstance(part, tuple) for part in parts):
+        return text
+    return tuple(parts)
+
+
+def _compile(value: Any) -> Any:
+    if isinstance(value, str):
+        return _compile_string(value)
+    if isinstance(value, dict):
+        return {key: _compile(nested) for key, nested in value.items()}
+    if isinstance(value, list):
+        return [_compile(nested) for nested in value]
+    return value
+
+
+def _lookup(scope: Dict[str, Any], path: Tuple[str, ...]) -> Any:
+    value: Any = scope
+    for segment in path:
+        if isinstance(value, dict):
+            value = value.get(segment, _MISSING)
+        elif isinstance(value, list) and segment.isdigit() and int(segment) < len(value):
+            value = value[int(segment)]
+        else:
+            return _MISSING
+        if value is _MISSING:
+            return _MISSING
+    return value
+
+
+class CompiledTemplate:
+    """
+    A prompt template with its placeholders parsed once.
+
+    Any string in the template body may reference fields with str.format
+    syntax, e.g. "Write user stories for {name}: {answers.goal}". Paths are
+    resolved against the context item first, then the template's own fields
+    (subject, description, instructions); {context} renders the whole item
+    as JSON. Unresolved placeholders are left in the text as written.
+    """
+
+    def __init__(self, template: Dict[str, Any]):
+        """
+        Args:
+            template: Template fields (subject, description, instructions, template)
+        """
+        self.fields = {key: value for key, value in template.items() if key not in ('template', 'objects')}
+        self._body = _compile(template.get('template') or {})
+        self.placeholders = sorted({'.'.join(path) for path in self._paths(self._body)})
+
+    @classmethod
+    def _paths(cls, compiled: Any):
+        if isinstance(compiled, tuple):
+            yield from (part for part in compiled if isinstance(part, tuple))
+        elif isinstance(compiled, dict):
+            for nested in compiled.values():
+                yield from cls._paths(nested)
+        elif isinstance(compiled, list):
+            for nested in compiled:
+                yield from cls._paths(nested)
+
+    def render(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Render the template body for one context item.
+
+        Args:
+            context: Context item the prompt is built from
+
+        Returns:
+            Dict[str, Any]: Rendered template body
+        """
+        return self._render(self._body, context)
+
+    def _render(self, compiled: Any, context: Dict[str, Any]) -> Any:
+        if isinstance(compiled, tuple):
+            return ''.join(
+                part if isinstance(part, str) else self._resolve(part, context)
+                for part in compiled
+            )
+        if isinstance(compiled, dict):
+            return {key: self._render(nested, context) for key, nested in compiled.items()}
+        if isinstance(compiled, list):
+            return [self._render(nested, context) for nested in compiled]
+        return compiled
+
+    def _resolve(self, path: Tuple[str, ...], context: Dict[str, Any]) -> str:
+        if path == ('context',) and 'context' not in context:
+            return json.dumps(context, default=str)
+        for scope in (context, self.fields):
+            value = _lookup(scope, path)
+            if value is not _MISSING:
+                return value if isinstance(value, str) else json.dumps(value, default=str)
+        return '{' + '.'.join(path) + '}'
+
+
+_CACHE: 'OrderedDict[str, Tuple[str, CompiledTemplate]]' = OrderedDict()
+_CACHE_SIZE = 256
+_CACHE_LOCK = threading.Lock()
+
+
+def compile_template(template: Dict[str, Any], template_id: Optional[str] = None) -> CompiledTemplate:
+    """
+    Compile a template, reusing the cached compiled form for its id.
+
+    The cached entry is only reused while the template body is unchanged,
+    so editing a stored template under the same id recompiles it.
+
+    Args:
+        template: Template fields
+        template_id: Cache key (the template's 'id' field when None; not cached without one)
+
+    Returns:
+        CompiledTemplate: The compiled template
+    """
+    template_id = template_id or template.get('id')
+    if template_id is None:
+        return CompiledTemplate(template)
+
+    version = json.dumps(template, sort_keys=True, default=str)
+    with _CACHE_LOCK:
+        cached = _CACHE.get(template_id)
+        if cached is not None and cached[0] == version:
+            _CACHE.move_to_end(template_id)
+            return cached[1]
+
+    compiled = CompiledTemplate(template)
+    with _CACHE_LOCK:
+        _CACHE[template_id] = (version, compiled)
+        _CACHE.move_to_end(template_id)
+        while len(_CACHE) > _CACHE_SIZE:
+            _CACHE.popitem(last=False)
+    return compiled
@@ -0,0 +1,28 @@
+import hashlib
+import json
+from typing import Any, Dict, Optional
+
+# Bookkeeping fields left out of an item's own hash
+HASH_FIELDS = ('content_hash', 'fingerprint')
+
+
+def _digest(value: Any) -> str:
+    canonical = json.dumps(value, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def content_hash(item: Dict[str, Any]) -> str:
+    """
+    Hash a stored content item, ignoring its bookkeeping fields.
+    """
+    return _digest({key: value for key, value in item.items() if key not in HASH_FIELDS})
+
+
+def fingerprint(template: Dict[str, Any], context: Dict[str, Any], params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Fingerprint the inputs of one generation: the template, the hash of the
+    context item it is rendered with, and the model parameters. Content
+    generated from identical inputs doesn't need to be generated again.
+    """
+    upstream = context.get('content_hash') or content_hash(context)
+    return _digest({'template': template, 'upstream': upstream, 'params': params or {}})
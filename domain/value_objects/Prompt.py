@@ -1,4 +1,10 @@
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+
 @dataclass
 class Prompt:
     template: Dict  # Modified template with context instead of objects
-    context: Dict   # Single context item from the referenced artifact
\ No newline at end of file
+    context: Dict   # Single context item from the referenced artifact
+    id: Optional[str] = None  # "<artifact type>:<context item id>", the id its generated content is stored under
+    payload: Optional[Dict] = None  # Template body rendered with the context, when it has placeholders
@@ -5,3 +5,4 @@ class PromptTemplate:
     instructions: str
     objects: List[str]  # References to other artifact types needed as context
     template: Dict
+    id: Optional[str] = None  # Key the compiled form is cached under
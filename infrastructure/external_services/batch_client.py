@@ -0,0 +1,155 @@
+import os
+import json
+import time
+import logging
+import tempfile
+from typing import Dict, Any, Iterable, Optional, Tuple, Union
+
+from infrastructure.external_services.service_integrator import ServiceIntegrator, RequestMethod
+
+
+# Batch states after which polling stops
+TERMINAL_STATUSES = frozenset({'completed', 'failed', 'expired', 'cancelled'})
+
+
+class BatchClient:
+    def __init__(
+        self,
+        integrator: ServiceIntegrator,
+        endpoint: str = '/v1/chat/completions',
+        completion_window: str = '24h',
+        poll_interval: float = 30.0,
+        batch_dir: Optional[str] = None
+    ):
+        """
+        Submit many requests as one provider batch job instead of one call each.
+
+        Follows the files + batches flow: upload a JSONL input file, create a
+        batch for it, poll until it reaches a terminal state, then download the
+        JSONL output and map each line back to its custom_id.
+
+        :param integrator: Integrator for the provider hosting the batch API
+        :param endpoint: Endpoint each batched request targets, relative to the API root
+        :param completion_window: Completion window requested from the provider
+        :param poll_interval: Seconds between status checks
+        :param batch_dir: Directory for batch input files (system temp dir when None)
+        """
+        self.integrator = integrator
+        self.endpoint = endpoint
+        self.completion_window = completion_window
+        self.poll_interval = poll_interval
+        self.batch_dir = batch_dir or tempfile.gettempdir()
+        self.logger = logging.getLogger(__name__)
+
+    def write_batch_file(self, payloads: Union[Dict[str, Dict[str, Any]], Iterable[Tuple[str, Dict[str, Any]]]]) -> str:
+        """
+        Serialize payloads to a JSONL batch input file, one line at a time.
+
+        :param payloads: Request bodies keyed by custom id, or (custom id, body) pairs
+        :return: Path of the written file
+        """
+        os.makedirs(self.batch_dir, exist_ok=True)
+        fd, path = tempfile.mkstemp(prefix='batch_', suffix='.jsonl', dir=self.batch_dir)
+        with os.fdopen(fd, 'w') as file:
+            for custom_id, body in payloads.items() if isinstance(payloads, dict) else payloads:
+                line = {'custom_id': custom_id, 'method': 'POST', 'url': self.endpoint, 'body': body}
+                file.write(json.dumps(line, separators=(',', ':')) + '\n')
+        return path
+
+    def submit(self, path: str) -> str:
+        """
+        Upload a batch input file and create a batch job for it.
+
+        :param path: Path of the JSONL input file
+        :return: Provider batch id
+        """
+        # Read the file up front: a retried upload must send the whole content
+        # again, which an already consumed file handle would not
+        with open(path, 'rb') as file:
+            content = file.read()
+        upload = self.integrator.make_request(
+            'files',
+            data={'purpose': 'batch'},
+            files={'file': (os.path.basename(path), content, 'application/jsonl')}
+        )
+        batch = self.integrator.make_request(
+            'batches',
+            json={
+                'input_file_id': upload['data']['id'],
+                'endpoint': self.endpoint,
+                'completion_window': self.completion_window
+            },
+            use_cache=False
+        )
+        self.logger.info(f"Submitted batch {batch['data']['id']} from {path}")
+        return batch['data']['id']
+
+    def wait(self, batch_id: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Poll a batch until it reaches a terminal status.
+
+        :param batch_id: Provider batch id
+        :param timeout: Seconds to wait before giving up (no limit when None)
+        :return: Final batch object
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            batch = self.integrator.make_request(
+                f'batches/{batch_id}', method=RequestMethod.GET, use_cache=False
+            )['data']
+            if batch['status'] in TERMINAL_STATUSES:
+                return batch
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"Batch {batch_id} still {batch['status']} after {timeout}s")
+            time.sleep(self.poll_interval)
+
+    def fetch_results(self, batch: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Download a finished batch's output and key response bodies by custom id.
+
+        Lines that failed individually are logged and left out.
+
+        :param batch: Batch object returned by wait()
+        :return: Response bodies keyed by custom id
+        """
+        results = {}
+        if not batch.get('output_file_id'):
+            return results
+
+        lines = self.integrator.stream_request(
+            f"files/{batch['output_file_id']}/content",
+            method=RequestMethod.GET,
+            stream_format='ndjson'
+        )
+        for line in lines:
+            response = line.get('response') or {}
+            if line.get('error') or response.get('status_code', 200) >= 400:
+                self.logger.warning(f"Batch item {line.get('custom_id')} failed: {line.get('error')}")
+                continue
+            results[line['custom_id']] = response.get('body')
+        return results
+
+    def run(
+        self,
+        payloads: Union[Dict[str, Dict[str, Any]], Iterable[Tuple[str, Dict[str, Any]]]],
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Write, submit and wait for a batch, returning its results.
+
+        :param payloads: Request bodies keyed by custom id, or (custom id, body) pairs
+        :param timeout: Seconds to wait for completion (no limit when None)
+        :return: Response bodies keyed by custom id (empty without payloads)
+        """
+        path = self.write_batch_file(payloads)
+        if os.path.getsize(path) == 0:
+            os.remove(path)
+            return {}
+        try:
+            batch = self.wait(self.submit(path), timeout=timeout)
+        finally:
+            os.remove(path)
+
+        if batch['status'] != 'completed':
+            self.logger.error(f"Batch {batch['id']} ended as {batch['status']}")
+        return self.fetch_results(batch)
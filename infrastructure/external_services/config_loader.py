@@ -1,10 +1,20 @@
-def load_config(config_path: str) -> Dict[str, Any]:
+import os
+import json
+from typing import Dict, Any, Optional
+
+# config.json at the project root
+DEFAULT_CONFIG_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'config.json'
+)
+
+
+def load_config(config_path: Optional[str] = None) -> Dict[str, Any]:
     """
     Load configuration from a JSON file.
     
-    :param config_path: Path to the configuration file
+    :param config_path: Path to the configuration file (the project's config.json when None)
     :return: Configuration dictionary
     """
-    with open(config_path, 'r') as f:
+    with open(config_path or DEFAULT_CONFIG_PATH, 'r') as f:
         return json.load(f)
 
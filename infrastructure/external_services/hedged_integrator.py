@@ -0,0 +1,154 @@
+import time
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, TimeoutError, wait
+from typing import Dict, Any, Iterator
+
+from infrastructure.external_services.service_integrator import ConcurrentRequests, ServiceIntegrator, RequestMethod
+
+
+class HedgedServiceIntegrator(ConcurrentRequests):
+    def __init__(
+        self,
+        primary: ServiceIntegrator,
+        secondary: ServiceIntegrator,
+        hedge_after: float = 10.0,
+        percentile: float = 0.95,
+        window: int = 200,
+        min_samples: int = 20,
+        max_workers: int = 32
+    ):
+        """
+        Send requests to a primary integrator and, if it has not answered within
+        the latency budget, duplicate them to a secondary one and take whichever
+        answers first.
+
+        The budget is the given percentile of recent primary latencies once
+        enough samples exist, and hedge_after until then. The secondary must
+        accept the same endpoint and payload as the primary.
+
+        :param primary: Integrator tried first
+        :param secondary: Integrator used for the hedged duplicate
+        :param hedge_after: Budget in seconds used before enough samples exist
+        :param percentile: Latency percentile used as the budget
+        :param window: Number of recent primary latencies kept
+        :param min_samples: Samples required before the percentile is trusted
+        :param max_workers: Threads available for in-flight primary and hedged calls
+        """
+        self.primary = primary
+        self.secondary = secondary
+        self.hedge_after = hedge_after
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.pool_maxsize = primary.pool_maxsize
+        self.max_workers = max_workers
+        self.logger = logging.getLogger(__name__)
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def hedge_budget(self) -> float:
+        """
+        Current time to wait for the primary before hedging.
+
+        :return: Budget in seconds
+        """
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return self.hedge_after
+            ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * self.percentile))]
+
+    def ensure_pool_size(self, size: int) -> None:
+        """
+        Grow both integrators' pools, and the worker pool to fit a primary
+        and a hedged call for each of size concurrent requests.
+
+        :param size: Requests in flight at once
+        """
+        self.primary.ensure_pool_size(size)
+        self.secondary.ensure_pool_size(size)
+        with self._lock:
+            self.pool_maxsize = max(self.pool_maxsize, size)
+            if self.max_workers >= 2 * size:
+                return
+            self.max_workers = 2 * size
+            # Calls already submitted finish on the old pool
+            replaced, self._executor = self._executor, ThreadPoolExecutor(max_workers=self.max_workers)
+        replaced.shutdown(wait=False)
+
+    def _record_latency(self, started: float) -> None:
+        with self._lock:
+            self._latencies.append(time.monotonic() - started)
+
+    def make_request(
+        self,
+        endpoint: str,
+        method: RequestMethod = RequestMethod.POST,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Make a request, hedging to the secondary once the budget is exceeded,
+        or straight away if the primary fails before it.
+
+        :param endpoint: Service endpoint
+        :param method: HTTP method
+        :param kwargs: Arguments forwarded to ServiceIntegrator.make_request
+        :return: Standardized response dictionary from the first successful answer
+        """
+        started = time.monotonic()
+        primary = self._executor.submit(self.primary.make_request, endpoint, method, **kwargs)
+        primary.add_done_callback(
+            lambda future: future.exception() is None and self._record_latency(started)
+        )
+
+        try:
+            return primary.result(timeout=self.hedge_budget())
+        except TimeoutError:
+            pass
+        except Exception as e:
+            self.logger.warning(f"Primary failed for {endpoint}: {e}")
+
+        self.logger.info(f"Hedging {endpoint} to {self.secondary.base_url}")
+        secondary = self._executor.submit(self.secondary.make_request, endpoint, method, **kwargs)
+
+        # Return the first success; only fail once both attempts have failed
+        pending = {primary, secondary}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+        return primary.result()
+
+    def stream_request(
+        self,
+        endpoint: str,
+        method: RequestMethod = RequestMethod.POST,
+        **kwargs
+    ) -> Iterator[Any]:
+        """
+        Stream a request from the primary. A stream can't be hedged once
+        chunks have been yielded, so it is not duplicated.
+
+        :param endpoint: Service endpoint
+        :param method: HTTP method
+        :param kwargs: Arguments forwarded to ServiceIntegrator.stream_request
+        :return: Generator of decoded chunks
+        """
+        return self.primary.stream_request(endpoint, method, **kwargs)
+
+    def close(self) -> None:
+        """
+        Stop the worker pool and close both integrators.
+        """
+        self._executor.shutdown(wait=False)
+        self.primary.close()
+        self.secondary.close()
+
+    def __enter__(self) -> 'HedgedServiceIntegrator':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
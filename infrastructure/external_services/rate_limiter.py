@@ -0,0 +1,205 @@
+import json
+import time
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Optional
+
+
+# Status codes that signal the provider wants us to slow down
+THROTTLE_STATUSES = frozenset({429, 503})
+
+
+def estimate_tokens(payload: Optional[Dict[str, Any]]) -> int:
+    """
+    Roughly estimate the tokens a request will consume against a quota.
+
+    Uses the common ~4 characters per token heuristic for the prompt and adds
+    the requested completion budget when the payload declares one.
+
+    :param payload: JSON payload of the request
+    :return: Estimated token count
+    """
+    if not payload:
+        return 0
+    prompt_tokens = len(json.dumps(payload, default=str)) // 4
+    completion_tokens = payload.get('max_tokens') or payload.get('max_output_tokens') or 0
+    return prompt_tokens + int(completion_tokens)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header given either as seconds or as an HTTP date.
+
+    :param value: Raw header value
+    :return: Seconds to wait, or None if absent or unparseable
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class TokenBucket:
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        """
+        Thread-safe token bucket refilled continuously.
+
+        :param rate_per_minute: Tokens added per minute
+        :param capacity: Maximum burst size (defaults to one minute of tokens)
+        """
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, amount: float = 1) -> None:
+        """
+        Block until the requested amount is available, then take it.
+
+        :param amount: Tokens to take (clamped to the bucket capacity)
+        """
+        amount = min(amount, self.capacity)
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                wait = (amount - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class AdaptiveConcurrencyLimiter:
+    def __init__(
+        self,
+        max_limit: int,
+        min_limit: int = 1,
+        initial_limit: Optional[int] = None,
+        decrease_factor: float = 0.5
+    ):
+        """
+        AIMD concurrency limit: grows by about one slot per round of successful
+        requests and is cut multiplicatively whenever the provider throttles.
+
+        :param max_limit: Upper bound on in-flight requests
+        :param min_limit: Lower bound on in-flight requests
+        :param initial_limit: Starting limit (defaults to max_limit)
+        :param decrease_factor: Multiplier applied to the limit on throttling
+        """
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.limit = float(initial_limit or max_limit)
+        self.decrease_factor = decrease_factor
+        self.in_flight = 0
+        self.blocked_until = 0.0
+        self._condition = threading.Condition()
+
+    def acquire(self) -> None:
+        """
+        Block until a slot is free and no backoff pause is in effect.
+        """
+        with self._condition:
+            while True:
+                pause = self.blocked_until - time.monotonic()
+                if pause > 0:
+                    self._condition.wait(pause)
+                elif self.in_flight < int(self.limit):
+                    break
+                else:
+                    self._condition.wait()
+            self.in_flight += 1
+
+    def release(self, throttled: bool = False, backoff: Optional[float] = None) -> None:
+        """
+        Free a slot and adapt the limit to the outcome of the request.
+
+        :param throttled: Whether the provider throttled the request
+        :param backoff: Seconds during which no new request may start
+        """
+        with self._condition:
+            self.in_flight -= 1
+            if throttled:
+                self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+            else:
+                self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+            if backoff:
+                self.blocked_until = max(self.blocked_until, time.monotonic() + backoff)
+            self._condition.notify_all()
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_concurrency: int = 16,
+        min_concurrency: int = 1
+    ):
+        """
+        Per-service client-side limiter combining request and token quotas
+        with adaptive concurrency.
+
+        :param requests_per_minute: Request quota (unlimited when None)
+        :param tokens_per_minute: Token quota (unlimited when None)
+        :param max_concurrency: Upper bound on in-flight requests
+        :param min_concurrency: Lower bound on in-flight requests after backoff
+        """
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.concurrency = AdaptiveConcurrencyLimiter(max_concurrency, min_concurrency)
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'RateLimiter':
+        """
+        Build a limiter from a service's 'rate_limits' configuration block.
+
+        :param config: Mapping with requests_per_minute, tokens_per_minute, max_concurrency
+        :return: Configured RateLimiter
+        """
+        return cls(
+            requests_per_minute=config.get('requests_per_minute'),
+            tokens_per_minute=config.get('tokens_per_minute'),
+            max_concurrency=config.get('max_concurrency', 16),
+            min_concurrency=config.get('min_concurrency', 1)
+        )
+
+    def acquire(self, tokens: int = 0) -> None:
+        """
+        Wait for a concurrency slot and for quota to cover the request.
+
+        :param tokens: Estimated tokens the request will consume
+        """
+        self.concurrency.acquire()
+        try:
+            if self.request_bucket is not None:
+                self.request_bucket.acquire(1)
+            if self.token_bucket is not None and tokens:
+                self.token_bucket.acquire(tokens)
+        except BaseException:
+            self.concurrency.release()
+            raise
+
+    def release(self, throttled: bool = False, backoff: Optional[float] = None) -> None:
+        """
+        Report the outcome of a request acquired with acquire().
+
+        :param throttled: Whether the provider answered with 429/503
+        :param backoff: Seconds to pause all new requests for this service
+        """
+        self.concurrency.release(throttled=throttled, backoff=backoff)
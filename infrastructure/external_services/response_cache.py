@@ -0,0 +1,177 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        cache_dir: Optional[str] = None,
+        max_disk_bytes: int = 512 * 1024 * 1024,
+        ttl: Optional[float] = None
+    ):
+        """
+        Two-tier cache of service responses keyed by request content.
+
+        :param max_entries: Maximum entries held in the in-memory LRU tier
+        :param cache_dir: Directory for the disk tier (disabled when None)
+        :param max_disk_bytes: Disk tier size above which the oldest entries are evicted
+        :param ttl: Entry lifetime in seconds (no expiry when None)
+        """
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl = ttl
+        self.logger = logging.getLogger(__name__)
+        self._memory: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_bytes = 0
+
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._disk_bytes = sum(
+                entry.stat().st_size
+                for entry in os.scandir(self.cache_dir)
+                if entry.name.endswith('.json')
+            )
+
+    @staticmethod
+    def make_key(
+        service: str,
+        endpoint: str,
+        method: str,
+        payload: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Build a stable content hash for a request.
+
+        :param service: Service identifier (e.g. base URL)
+        :param endpoint: Service endpoint
+        :param method: HTTP method name
+        :param payload: JSON payload, including model parameters
+        :param params: Query parameters
+        :return: Hex digest identifying the request
+        """
+        material = json.dumps(
+            [service, endpoint.lstrip('/'), method, payload, params],
+            sort_keys=True,
+            separators=(',', ':'),
+            default=str
+        )
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def _expired(self, created: float) -> bool:
+        return self.ttl is not None and time.time() - created > self.ttl
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response, promoting disk hits into memory.
+
+        :param key: Request key from make_key
+        :return: Cached response, or None on a miss
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created, response = entry
+                if not self._expired(created):
+                    self._memory.move_to_end(key)
+                    return response
+                del self._memory[key]
+
+        if not self.cache_dir:
+            return None
+
+        try:
+            with open(self._path(key), 'r') as file:
+                entry = json.load(file)
+        except (IOError, ValueError):
+            return None
+
+        if self._expired(entry['created']):
+            self._remove_file(key)
+            return None
+
+        self._remember(key, entry['created'], entry['response'])
+        return entry['response']
+
+    def set(self, key: str, response: Dict[str, Any]) -> None:
+        """
+        Store a response in both tiers.
+
+        :param key: Request key from make_key
+        :param response: Standardized response dictionary
+        """
+        created = time.time()
+        self._remember(key, created, response)
+
+        if not self.cache_dir:
+            return
+
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            previous = os.path.getsize(path) if os.path.exists(path) else 0
+            with open(tmp_path, 'w') as file:
+                json.dump({'created': created, 'response': response}, file, separators=(',', ':'))
+            os.replace(tmp_path, path)
+            with self._lock:
+                self._disk_bytes += os.path.getsize(path) - previous
+        except (IOError, TypeError) as e:
+            self.logger.warning(f"Could not write cache entry: {e}")
+            return
+
+        if self._disk_bytes > self.max_disk_bytes:
+            self._evict_disk()
+
+    def _remember(self, key: str, created: float, response: Dict[str, Any]) -> None:
+        with self._lock:
+            self._memory[key] = (created, response)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _remove_file(self, key: str) -> None:
+        path = self._path(key)
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return
+        with self._lock:
+            self._disk_bytes -= size
+
+    def _evict_disk(self) -> None:
+        """
+        Drop expired entries, then the oldest ones, until under max_disk_bytes.
+        """
+        entries = sorted(
+            (entry for entry in os.scandir(self.cache_dir) if entry.name.endswith('.json')),
+            key=lambda entry: entry.stat().st_mtime
+        )
+        for entry in entries:
+            expired = self._expired(entry.stat().st_mtime)
+            if not expired and self._disk_bytes <= self.max_disk_bytes:
+                break
+            self._remove_file(entry.name[:-len('.json')])
+
+    def clear(self) -> None:
+        """
+        Remove every entry from both tiers.
+        """
+        with self._lock:
+            self._memory.clear()
+        if self.cache_dir:
+            for entry in os.scandir(self.cache_dir):
+                if entry.name.endswith('.json'):
+                    self._remove_file(entry.name[:-len('.json')])
@@ -0,0 +1,114 @@
+import random
+import requests
+from typing import Dict, Any, FrozenSet, Optional
+
+
+# Methods that can be repeated without changing the outcome
+IDEMPOTENT_METHODS = frozenset({'GET', 'PUT', 'DELETE'})
+
+
+class RetryPolicy:
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        safe_statuses: FrozenSet[int] = frozenset({429, 503}),
+        idempotent_statuses: FrozenSet[int] = frozenset({408, 500, 502, 504}),
+        idempotent_methods: FrozenSet[str] = IDEMPOTENT_METHODS
+    ):
+        """
+        Decide whether a failed request is retried and how long to wait first.
+
+        Statuses in safe_statuses mean the server did not process the request,
+        so they are retried for any method. Statuses in idempotent_statuses and
+        mid-request transport errors are only retried when repeating the
+        request is safe.
+
+        :param max_attempts: Total attempts including the first one
+        :param base_delay: Backoff before the first retry, doubled on each attempt
+        :param max_delay: Upper bound on a single backoff
+        :param safe_statuses: Statuses retried regardless of idempotency
+        :param idempotent_statuses: Statuses retried only for idempotent requests
+        :param idempotent_methods: HTTP methods treated as idempotent by default
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.safe_statuses = frozenset(safe_statuses)
+        self.idempotent_statuses = frozenset(idempotent_statuses)
+        self.idempotent_methods = frozenset(idempotent_methods)
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'RetryPolicy':
+        """
+        Build a policy from a service's 'retry' configuration block.
+
+        :param config: Mapping of constructor arguments
+        :return: Configured RetryPolicy
+        """
+        options = dict(config)
+        for key in ('safe_statuses', 'idempotent_statuses', 'idempotent_methods'):
+            if key in options:
+                options[key] = frozenset(options[key])
+        return cls(**options)
+
+    def is_idempotent(
+        self,
+        method: str,
+        headers: Optional[Dict[str, str]] = None,
+        idempotent: Optional[bool] = None
+    ) -> bool:
+        """
+        Whether a request may be repeated safely.
+
+        :param method: HTTP method name
+        :param headers: Request headers; an Idempotency-Key marks any method safe
+        :param idempotent: Explicit override from the caller
+        :return: True if the request can be retried after partial processing
+        """
+        if idempotent is not None:
+            return idempotent
+        if headers and any(key.lower() == 'idempotency-key' for key in headers):
+            return True
+        return method.upper() in self.idempotent_methods
+
+    def should_retry(
+        self,
+        attempt: int,
+        idempotent: bool,
+        status: Optional[int] = None,
+        error: Optional[Exception] = None
+    ) -> bool:
+        """
+        Whether to retry after a failed attempt.
+
+        :param attempt: Zero-based number of the attempt that just failed
+        :param idempotent: Whether the request may be repeated safely
+        :param status: HTTP status of the response, if one was received
+        :param error: Transport error raised instead of a response
+        :return: True if another attempt should be made
+        """
+        if attempt + 1 >= self.max_attempts:
+            return False
+        if error is not None:
+            # A connect timeout never reached the server; anything else may have
+            if isinstance(error, requests.ConnectTimeout):
+                return True
+            return idempotent and isinstance(error, (requests.ConnectionError, requests.Timeout))
+        if status in self.safe_statuses:
+            return True
+        return idempotent and status in self.idempotent_statuses
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Delay before the next attempt, using exponential backoff with full jitter.
+
+        :param attempt: Zero-based number of the attempt that just failed
+        :param retry_after: Server-provided minimum delay, honored when present
+        :return: Seconds to wait
+        """
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
@@ -1,20 +1,38 @@
 import os
-from service_integrator import ServiceIntegrator
-from config_loader import load_config
+from typing import Any, Dict, Optional
+from infrastructure.external_services.service_integrator import ServiceIntegrator
+from infrastructure.external_services.response_cache import ResponseCache
+from infrastructure.external_services.rate_limiter import RateLimiter
+from infrastructure.external_services.retry_policy import RetryPolicy
+from infrastructure.external_services.hedged_integrator import HedgedServiceIntegrator
+from infrastructure.external_services.config_loader import load_config
 
-def create_service_integrator(service_name: str) -> ServiceIntegrator:
+def get_service_config(service_name: str) -> Dict[str, Any]:
+    """
+    Look up a service's configuration block.
+    
+    :param service_name: Name of the service
+    :return: The service's configuration
+    """
+    config = load_config().get(service_name.lower())
+    if not config:
+        raise ValueError(f"Unsupported service: {service_name}")
+    return config
+
+
+def create_service_integrator(
+    service_name: str,
+    cache: Optional[ResponseCache] = None
+) -> ServiceIntegrator:
     """
     Factory method to create service-specific integrators.
     
     :param service_name: Name of the service to integrate
+    :param cache: Optional response cache shared by the integrator
     :return: Configured ServiceIntegrator
     """
     # Load configuration from external file
-    service_configs = load_config()
-    
-    config = service_configs.get(service_name.lower())
-    if not config:
-        raise ValueError(f"Unsupported service: {service_name}")
+    config = get_service_config(service_name)
     
     # Get API key from environment variable
     api_key = os.getenv(f"{service_name.upper()}_API_KEY")
@@ -24,5 +42,35 @@ def create_service_integrator(service_name: str) -> ServiceIntegrator:
     return ServiceIntegrator(
         base_url=config['base_url'], 
         api_key=api_key,
-        auth_type=config.get('auth_type')
+        auth_type=config.get('auth_type'),
+        pool_connections=config.get('pool_connections', 10),
+        pool_maxsize=config.get('pool_maxsize', 10),
+        pool_block=config.get('pool_block', False),
+        keep_alive=config.get('keep_alive', True),
+        cache=cache,
+        rate_limiter=RateLimiter.from_config(config['rate_limits']) if 'rate_limits' in config else None,
+        retry_policy=RetryPolicy.from_config(config['retry']) if 'retry' in config else None
+    )
+
+
+def create_hedged_integrator(
+    primary_service: str,
+    secondary_service: str,
+    hedge_after: float = 10.0,
+    cache: Optional[ResponseCache] = None
+) -> HedgedServiceIntegrator:
+    """
+    Factory method to create an integrator that hedges slow requests to a
+    secondary provider.
+    
+    :param primary_service: Name of the service tried first
+    :param secondary_service: Name of the service used for hedged duplicates
+    :param hedge_after: Hedge budget in seconds until enough latencies are observed
+    :param cache: Optional response cache shared by both integrators
+    :return: Configured HedgedServiceIntegrator
+    """
+    return HedgedServiceIntegrator(
+        primary=create_service_integrator(primary_service, cache=cache),
+        secondary=create_service_integrator(secondary_service, cache=cache),
+        hedge_after=hedge_after
     )
@@ -1,9 +1,18 @@
 import os
 import json
+import time
+import asyncio
+import functools
+import threading
 import requests
-from typing import Dict, Any, Optional
+from concurrent.futures import Executor, ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from typing import Dict, Any, Iterable, Iterator, List, Optional
 import logging
 from enum import Enum, auto
+from infrastructure.external_services.response_cache import ResponseCache
+from infrastructure.external_services.rate_limiter import RateLimiter, THROTTLE_STATUSES, estimate_tokens, parse_retry_after
+from infrastructure.external_services.retry_policy import RetryPolicy
 
 
 class RequestMethod(Enum):
@@ -14,14 +23,133 @@ class RequestMethod(Enum):
     PATCH = auto()
 
 
-class ServiceIntegrator:
+def chunk_text(chunk: Any) -> str:
+    """
+    Extract the completion text carried by a single streamed chunk.
+
+    Understands the OpenAI, Anthropic and Gemini streaming shapes and falls
+    back to the raw value for plain-text chunks.
+
+    :param chunk: Decoded stream chunk
+    :return: Text delta, or an empty string for control events
+    """
+    if isinstance(chunk, str):
+        return chunk
+    if not isinstance(chunk, dict):
+        return ''
+    if 'choices' in chunk:
+        choices = chunk['choices'] or [{}]
+        return (choices[0].get('delta') or {}).get('content') or ''
+    if 'delta' in chunk:
+        return chunk['delta'].get('text') or ''
+    if 'candidates' in chunk:
+        parts = chunk['candidates'][0].get('content', {}).get('parts', [])
+        return ''.join(part.get('text', '') for part in parts)
+    return ''
+
+
+class ConcurrentRequests:
+    """
+    Asynchronous fan-out over a blocking make_request.
+
+    Requests run on a thread pool sized to the requested concurrency rather
+    than asyncio's default executor, whose min(32, cpu + 4) threads would
+    otherwise cap it. Subclasses provide make_request, pool_maxsize and
+    ensure_pool_size.
+    """
+    pool_maxsize: int
+
+    def make_request(self, endpoint: str, method: RequestMethod = RequestMethod.POST, **kwargs) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def ensure_pool_size(self, size: int) -> None:
+        """
+        Grow the connection pool so size requests can be in flight at once.
+        """
+        raise NotImplementedError
+
+    async def amake_request(
+        self,
+        endpoint: str,
+        method: RequestMethod = RequestMethod.POST,
+        executor: Optional[Executor] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Asynchronous counterpart of make_request.
+
+        The blocking call runs in a worker thread against the shared session,
+        so concurrent requests reuse pooled connections.
+
+        :param endpoint: Service endpoint
+        :param method: HTTP method
+        :param executor: Thread pool to run on (asyncio's default executor when None)
+        :param kwargs: Arguments forwarded to make_request
+        :return: Standardized response dictionary
+        """
+        call = functools.partial(self.make_request, endpoint, method, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(executor, call)
+
+    async def gather_requests(
+        self,
+        endpoint: str,
+        payloads: Iterable[Dict[str, Any]],
+        method: RequestMethod = RequestMethod.POST,
+        max_concurrency: Optional[int] = None,
+        return_exceptions: bool = False,
+        **kwargs
+    ) -> List[Any]:
+        """
+        Send one request per JSON payload concurrently, at most max_concurrency at a time.
+
+        Payloads are pulled from the iterable only as a slot frees up, so a lazy
+        iterable is rendered while earlier requests are in flight rather than
+        all at once before the first is sent.
+
+        :param endpoint: Service endpoint
+        :param payloads: JSON payloads, one per request
+        :param method: HTTP method
+        :param max_concurrency: Maximum in-flight requests (defaults to pool_maxsize)
+        :param return_exceptions: Return failures in place instead of raising the first one
+        :param kwargs: Arguments forwarded to make_request
+        :return: Responses in the same order as payloads
+        """
+        limit = max_concurrency or self.pool_maxsize
+        self.ensure_pool_size(limit)
+        pending = enumerate(payloads)
+        results: Dict[int, Any] = {}
+
+        with ThreadPoolExecutor(max_workers=limit) as executor:
+            async def worker() -> None:
+                for index, payload in pending:
+                    try:
+                        results[index] = await self.amake_request(
+                            endpoint, method, executor=executor, json=payload, **kwargs
+                        )
+                    except Exception as e:
+                        if not return_exceptions:
+                            raise
+                        results[index] = e
+
+            await asyncio.gather(*(worker() for _ in range(limit)))
+        return [results[index] for index in range(len(results))]
+
+
+class ServiceIntegrator(ConcurrentRequests):
     def __init__(
         self, 
         base_url: str, 
         api_key: Optional[str] = None,
         timeout: int = 30,  # Increased timeout for LLM services
         default_headers: Optional[Dict[str, str]] = None,
-        auth_type: Optional[str] = None  # 'bearer', 'basic', etc.
+        auth_type: Optional[str] = None,  # 'bearer', 'basic', etc.
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        cache: Optional[ResponseCache] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None
     ):
         """
         Initialize the Service Integrator with flexible authentication.
@@ -31,13 +159,28 @@ class ServiceIntegrator:
         :param timeout: Request timeout in seconds
         :param default_headers: Default headers to be sent with each request
         :param auth_type: Authentication type (bearer, basic, etc.)
+        :param pool_connections: Number of per-host connection pools to keep
+        :param pool_maxsize: Maximum connections kept alive per host
+        :param pool_block: Block when a host's pool is exhausted instead of opening extra connections
+        :param keep_alive: Reuse connections across requests
+        :param cache: Response cache consulted before each request
+        :param rate_limiter: Client-side quota and concurrency limiter for this service
+        :param retry_policy: Retry and backoff rules (defaults to RetryPolicy())
         """
         self.base_url = base_url.rstrip('/')
         self.api_key = api_key
         self.timeout = timeout
         self.default_headers = default_headers or {}
         self.auth_type = auth_type
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy or RetryPolicy()
         self.logger = logging.getLogger(__name__)
+        self._pool_lock = threading.Lock()
 
         # Set up authentication headers
         if self.api_key:
@@ -52,6 +195,64 @@ class ServiceIntegrator:
                 # Default API key header for many services
                 self.default_headers['api-key'] = self.api_key
 
+        if not self.keep_alive:
+            self.default_headers['Connection'] = 'close'
+
+        self.session = self._create_session()
+
+    def _create_session(self) -> requests.Session:
+        """
+        Create a session backed by a pooled adapter shared across requests.
+
+        :return: Configured requests session
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def ensure_pool_size(self, size: int) -> None:
+        """
+        Grow the per-host connection pool to at least size connections.
+
+        Connections beyond pool_maxsize would be opened and discarded on every
+        request, so a fan-out wider than the pool remounts a larger adapter.
+
+        :param size: Connections needed at once
+        """
+        with self._pool_lock:
+            if size <= self.pool_maxsize:
+                return
+            self.pool_maxsize = size
+            replaced = set(self.session.adapters.values())
+            adapter = HTTPAdapter(
+                pool_connections=self.pool_connections,
+                pool_maxsize=self.pool_maxsize,
+                pool_block=self.pool_block
+            )
+            self.session.mount('https://', adapter)
+            self.session.mount('http://', adapter)
+        # Closes idle connections; ones still in use are closed when released
+        for old in replaced:
+            old.close()
+
+    def close(self) -> None:
+        """
+        Close the underlying session and release pooled connections.
+        """
+        self.session.close()
+
+    def __enter__(self) -> 'ServiceIntegrator':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
     def make_request(
         self, 
         endpoint: str, 
@@ -60,6 +261,8 @@ class ServiceIntegrator:
         data: Optional[Dict[str, Any]] = None,
         json: Optional[Dict[str, Any]] = None,
         headers: Optional[Dict[str, str]] = None,
+        use_cache: bool = True,
+        idempotent: Optional[bool] = None,
         **kwargs
     ) -> Dict[str, Any]:
         """
@@ -71,9 +274,20 @@ class ServiceIntegrator:
         :param data: Form data
         :param json: JSON payload
         :param headers: Additional headers
+        :param use_cache: Serve from and store into the response cache, if configured
+        :param idempotent: Whether the request may be retried after partial processing
+                           (inferred from the method and an Idempotency-Key header when None)
         :param kwargs: Additional arguments for requests library
         :return: Standardized response dictionary
         """
+        cache_key = None
+        if self.cache is not None and use_cache and data is None:
+            cache_key = ResponseCache.make_key(self.base_url, endpoint, method.name, json, params)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self.logger.debug(f"Cache hit for {endpoint}")
+                return cached
+
         # Merge headers
         request_headers = {**self.default_headers, **(headers or {})}
         
@@ -82,36 +296,205 @@ class ServiceIntegrator:
         
         self.logger.info(f"Request to {full_url}")
         
+        tokens = estimate_tokens(json) if self.rate_limiter is not None else 0
+        idempotent = self.retry_policy.is_idempotent(method.name, request_headers, idempotent)
+        
         try:
-            request_methods = {
-                RequestMethod.GET: requests.get,
-                RequestMethod.POST: requests.post,
-                RequestMethod.PUT: requests.put,
-                RequestMethod.DELETE: requests.delete,
-                RequestMethod.PATCH: requests.patch
-            }
-            
-            response = request_methods[method](
-                full_url, 
-                params=params, 
-                data=data, 
-                json=json, 
-                headers=request_headers,
-                timeout=self.timeout,
-                **kwargs
-            )
+            attempt = 0
+            while True:
+                try:
+                    response = self._send(
+                        method,
+                        full_url,
+                        tokens,
+                        attempt,
+                        params=params, 
+                        data=data, 
+                        json=json, 
+                        headers=request_headers,
+                        timeout=self.timeout,
+                        **kwargs
+                    )
+                except requests.RequestException as e:
+                    if not self.retry_policy.should_retry(attempt, idempotent, error=e):
+                        raise
+                    delay = self.retry_policy.backoff(attempt)
+                    reason = type(e).__name__
+                else:
+                    status = response.status_code
+                    if status < 400 or not self.retry_policy.should_retry(attempt, idempotent, status=status):
+                        break
+                    # The rate limiter already pauses throttled services itself
+                    if self.rate_limiter is not None and status in THROTTLE_STATUSES:
+                        delay = 0.0
+                    else:
+                        retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                        delay = self.retry_policy.backoff(attempt, retry_after)
+                    reason = status
+                
+                attempt += 1
+                self.logger.warning(
+                    f"Retrying {full_url} after {reason} (attempt {attempt + 1}) in {delay:.2f}s"
+                )
+                time.sleep(delay)
             
             response.raise_for_status()
-            return {
+            result = {
                 'status_code': response.status_code,
                 'headers': dict(response.headers),
                 'data': response.json() if response.content else None
             }
+            if cache_key is not None:
+                self.cache.set(cache_key, result)
+            return result
         
         except requests.RequestException as e:
             self.logger.error(f"Request failed: {e}")
             raise
 
+    def _send(
+        self,
+        method: RequestMethod,
+        full_url: str,
+        tokens: int,
+        attempt: int,
+        **request_kwargs
+    ) -> requests.Response:
+        """
+        Send a single request through the rate limiter, if one is configured.
+
+        On a throttling status the limiter shrinks its concurrency and pauses
+        new requests for the Retry-After delay, or the retry policy's backoff.
+
+        :param method: HTTP method
+        :param full_url: Absolute request URL
+        :param tokens: Estimated tokens the request consumes
+        :param attempt: Zero-based attempt number, used for the fallback delay
+        :param request_kwargs: Arguments for session.request
+        :return: Raw response
+        """
+        if self.rate_limiter is None:
+            return self.session.request(method.name, full_url, **request_kwargs)
+
+        self.rate_limiter.acquire(tokens)
+        throttled, backoff = False, None
+        try:
+            response = self.session.request(method.name, full_url, **request_kwargs)
+            if response.status_code in THROTTLE_STATUSES:
+                throttled = True
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                backoff = self.retry_policy.backoff(attempt, retry_after)
+            return response
+        finally:
+            self.rate_limiter.release(throttled=throttled, backoff=backoff)
+
+    def stream_request(
+        self,
+        endpoint: str,
+        method: RequestMethod = RequestMethod.POST,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        stream_format: Optional[str] = None,
+        **kwargs
+    ) -> Iterator[Any]:
+        """
+        Make a streaming request and yield decoded chunks as they arrive.
+
+        :param endpoint: Service endpoint
+        :param method: HTTP method
+        :param params: Query parameters
+        :param json: JSON payload
+        :param headers: Additional headers
+        :param stream_format: 'sse' or 'ndjson'; detected from Content-Type when omitted
+        :param kwargs: Additional arguments for requests library
+        :return: Generator of decoded chunks (parsed JSON, or raw text when not JSON)
+        """
+        request_headers = {**self.default_headers, **(headers or {})}
+        full_url = f"{self.base_url}/{endpoint.lstrip('/')}"
+
+        self.logger.info(f"Streaming request to {full_url}")
 
+        if self.rate_limiter is not None:
+            # Hold a concurrency slot for the whole lifetime of the stream
+            self.rate_limiter.acquire(estimate_tokens(json))
+        throttled = False
 
+        try:
+            try:
+                response = self.session.request(
+                    method.name,
+                    full_url,
+                    params=params,
+                    json=json,
+                    headers=request_headers,
+                    timeout=self.timeout,
+                    stream=True,
+                    **kwargs
+                )
+                throttled = response.status_code in THROTTLE_STATUSES
+                response.raise_for_status()
+            except requests.RequestException as e:
+                self.logger.error(f"Request failed: {e}")
+                raise
 
+            with response:
+                if stream_format is None:
+                    content_type = response.headers.get('Content-Type', '')
+                    stream_format = 'sse' if 'text/event-stream' in content_type else 'ndjson'
+                response.encoding = response.encoding or 'utf-8'
+                lines = response.iter_lines(decode_unicode=True)
+
+                if stream_format == 'sse':
+                    yield from self._iter_sse(lines)
+                else:
+                    yield from self._iter_ndjson(lines)
+        finally:
+            if self.rate_limiter is not None:
+                backoff = None
+                if throttled:
+                    backoff = parse_retry_after(response.headers.get('Retry-After'))
+                self.rate_limiter.release(throttled=throttled, backoff=backoff)
+
+    @staticmethod
+    def _decode_chunk(payload: str) -> Any:
+        try:
+            return json.loads(payload)
+        except ValueError:
+            return payload
+
+    @classmethod
+    def _iter_sse(cls, lines: Iterable[str]) -> Iterator[Any]:
+        """
+        Decode server-sent events, yielding the data of each event.
+        """
+        data_lines = []
+        for line in lines:
+            if line:
+                if line.startswith(':'):
+                    continue
+                field, _, value = line.partition(':')
+                if field == 'data':
+                    data_lines.append(value[1:] if value.startswith(' ') else value)
+                continue
+
+            # A blank line dispatches the buffered event
+            if not data_lines:
+                continue
+            payload = '\n'.join(data_lines)
+            data_lines = []
+            if payload == '[DONE]':
+                return
+            yield cls._decode_chunk(payload)
+
+        if data_lines and '\n'.join(data_lines) != '[DONE]':
+            yield cls._decode_chunk('\n'.join(data_lines))
+
+    @classmethod
+    def _iter_ndjson(cls, lines: Iterable[str]) -> Iterator[Any]:
+        """
+        Decode newline-delimited JSON, yielding one chunk per non-empty line.
+        """
+        for line in lines:
+            if line.strip():
+                yield cls._decode_chunk(line)
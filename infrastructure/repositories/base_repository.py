@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import Any, List, Optional
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from text_index import InvertedIndex
 
 class BaseRepository(ABC):
     """
@@ -69,4 +71,151 @@ class BaseRepository(ABC):
         Returns:
             A list of items matching the given criteria
         """
-        pass
\ No newline at end of file
+        pass
+    
+    def save_many(self, items: List[Any]) -> int:
+        """
+        Save several items in one batch.
+        
+        Backends override this with a native bulk write; the default
+        saves items one at a time.
+        
+        Args:
+            items: The items to be saved
+        
+        Returns:
+            The number of items saved
+        """
+        return sum(1 for item in items if self.save(item) is not None)
+    
+    def load_many(self, identifiers: List[Any]) -> List[Optional[Any]]:
+        """
+        Load several items by their identifiers.
+        
+        Args:
+            identifiers: Unique identifiers of the items to be retrieved
+        
+        Returns:
+            The retrieved items in the order of identifiers, with None for missing ones
+        """
+        return [self.load(identifier) for identifier in identifiers]
+    
+    def delete_many(self, identifiers: List[Any]) -> int:
+        """
+        Delete several items in one batch.
+        
+        Args:
+            identifiers: Unique identifiers of the items to be deleted
+        
+        Returns:
+            The number of items deleted
+        """
+        return sum(1 for identifier in identifiers if self.delete(identifier))
+    
+    def iter_all(
+        self,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        fields: Optional[List[str]] = None,
+        order_by: Optional[str] = None
+    ) -> Iterator[Any]:
+        """
+        Iterate over items in the repository without building a result list.
+        
+        Backends override this to stream from storage; the default pages
+        over get_all().
+        
+        Args:
+            limit: Maximum number of items to yield
+            offset: Number of items to skip first
+            fields: Fields to keep in each item (all fields when None)
+            order_by: Field to sort by, prefixed with '-' for descending order
+        
+        Returns:
+            An iterator over the selected items
+        """
+        return self._paginate(self.get_all(), limit, offset, fields, order_by)
+    
+    def iter_find_by(
+        self,
+        criteria: dict,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        fields: Optional[List[str]] = None,
+        order_by: Optional[str] = None
+    ) -> Iterator[Any]:
+        """
+        Iterate over items matching specific criteria without building a result list.
+        
+        Args:
+            criteria: A dictionary of search criteria
+            limit: Maximum number of items to yield
+            offset: Number of matching items to skip first
+            fields: Fields to keep in each item (all fields when None)
+            order_by: Field to sort by, prefixed with '-' for descending order
+        
+        Returns:
+            An iterator over the matching items
+        """
+        return self._paginate(self.find_by(criteria), limit, offset, fields, order_by)
+    
+    def search(self, text: str, criteria: Optional[dict] = None, top_k: Optional[int] = 10) -> List[Dict[str, Any]]:
+        """
+        Rank items matching criteria against a free-text query with BM25.
+        
+        Backends with a maintained inverted index override this; the default
+        indexes the matching items on the fly, which scans them all.
+        
+        Args:
+            text: Free-text query
+            criteria: A dictionary of search criteria the items must also match
+            top_k: Maximum number of items to return (all matches when None)
+        
+        Returns:
+            Items containing any query term, most relevant first
+        """
+        index = InvertedIndex()
+        items = {}
+        for position, item in enumerate(self.iter_find_by(criteria or {})):
+            items[str(position)] = item
+            index.add(str(position), item)
+        return [items[key] for key, _ in index.search(text, top_k)]
+    
+    def freeze(self, path: str, indexed_fields: Iterable[str] = ()) -> int:
+        """
+        Write every item to a single indexed snapshot file that a
+        SnapshotRepository can serve read-only from a memory map.
+        
+        Args:
+            path: Destination snapshot file
+            indexed_fields: Fields with an index for equality lookups
+        
+        Returns:
+            The number of items written
+        """
+        from snapshot_repository import write_snapshot
+        return write_snapshot(self.iter_all(), path, indexed_fields)
+    
+    @staticmethod
+    def _paginate(
+        items: Iterable[dict],
+        limit: Optional[int] = None,
+        offset: int = 0,
+        fields: Optional[List[str]] = None,
+        order_by: Optional[str] = None
+    ) -> Iterator[dict]:
+        """
+        Apply ordering, offset, limit and projection to a stream of dict items.
+        
+        Items are only materialized when an ordering is requested.
+        """
+        if order_by:
+            field = order_by.lstrip('-')
+            items = sorted(
+                items,
+                key=lambda item: (item.get(field) is None, item.get(field)),
+                reverse=order_by.startswith('-')
+            )
+        stop = None if limit is None else offset + limit
+        for item in islice(items, offset, stop):
+            yield {f: item[f] for f in fields if f in item} if fields else item
@@ -0,0 +1,237 @@
+import json
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+from base_repository import BaseRepository
+
+_MISSING = object()
+
+
+class CachedRepository(BaseRepository):
+    """
+    A read-through caching decorator for any BaseRepository implementation.
+
+    Caches load results in an LRU with optional TTL and memoizes get_all/find_by
+    results keyed on their arguments. Writes go straight through to the wrapped
+    repository and invalidate the affected entries. Any other attribute, such as
+    transaction() or close(), is delegated to the wrapped repository.
+    """
+
+    def __init__(self, repository: BaseRepository, max_entries: int = 1024, ttl: Optional[float] = None):
+        """
+        Wrap a repository with a cache.
+
+        Args:
+            repository (BaseRepository): The repository to cache
+            max_entries (int): Maximum entries kept in each cache
+            ttl (float): Seconds an entry stays valid (no expiry when None)
+        """
+        self.repository = repository
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._generation = 0
+        self._lock = threading.RLock()
+        self._loads: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._queries: 'OrderedDict[str, tuple]' = OrderedDict()
+
+    def __getattr__(self, name: str) -> Any:
+        if name == 'repository':
+            raise AttributeError(name)
+        return getattr(self.repository, name)
+
+    @staticmethod
+    def _key(*parts: Any) -> str:
+        return json.dumps(parts, sort_keys=True, default=str)
+
+    @classmethod
+    def _copy(cls, value: Any) -> Any:
+        """
+        Shallow-copy cached results so callers can't mutate the cache.
+        """
+        if isinstance(value, dict):
+            return dict(value)
+        if isinstance(value, list):
+            return [cls._copy(item) for item in value]
+        return value
+
+    def _get(self, cache: OrderedDict, key: str) -> Any:
+        with self._lock:
+            entry = cache.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if self.ttl is None or time.monotonic() - stored_at <= self.ttl:
+                    cache.move_to_end(key)
+                    self.hits += 1
+                    return self._copy(value)
+                del cache[key]
+            self.misses += 1
+            return _MISSING
+
+    def _put(self, cache: OrderedDict, key: str, value: Any, generation: int) -> None:
+        with self._lock:
+            # A write landed while the value was being computed, so it may be stale
+            if generation != self._generation:
+                return
+            cache[key] = (time.monotonic(), self._copy(value))
+            cache.move_to_end(key)
+            while len(cache) > self.max_entries:
+                cache.popitem(last=False)
+
+    def _invalidate(self, identifiers: Optional[List[Any]] = None) -> None:
+        """
+        Drop cached loads for the given identifiers (all of them when unknown)
+        and every memoized query.
+        """
+        with self._lock:
+            self._generation += 1
+            if identifiers is None:
+                self._loads.clear()
+            else:
+                for identifier in identifiers:
+                    self._loads.pop(self._key(identifier), None)
+            self._queries.clear()
+
+    @staticmethod
+    def _identifier_of(data: Any) -> Any:
+        return data.get('id') if isinstance(data, dict) else None
+
+    def save(self, data: Any) -> Any:
+        """
+        Save through to the wrapped repository and invalidate affected entries.
+        """
+        try:
+            return self.repository.save(data)
+        finally:
+            identifier = self._identifier_of(data)
+            self._invalidate(None if identifier is None else [identifier, str(identifier)])
+
+    def load(self, identifier: Any) -> Optional[Any]:
+        """
+        Load an item, serving repeat lookups from the cache.
+        """
+        key = self._key(identifier)
+        generation = self._generation
+        value = self._get(self._loads, key)
+        if value is _MISSING:
+            value = self.repository.load(identifier)
+            if value is not None:
+                self._put(self._loads, key, value, generation)
+        return value
+
+    def delete(self, identifier: Any) -> bool:
+        """
+        Delete through to the wrapped repository and invalidate affected entries.
+        """
+        try:
+            return self.repository.delete(identifier)
+        finally:
+            self._invalidate(None if isinstance(identifier, dict) else [identifier, str(identifier)])
+
+    def get_all(self, *args: Any) -> List[Any]:
+        """
+        Retrieve all items, memoized until the next write.
+        """
+        return self._memoized('get_all', args, lambda: self.repository.get_all(*args))
+
+    def find_by(self, criteria: dict) -> List[Any]:
+        """
+        Find items matching criteria, memoized per criteria until the next write.
+        """
+        return self._memoized('find_by', (criteria,), lambda: self.repository.find_by(criteria))
+
+    def _memoized(self, operation: str, args: tuple, compute) -> Any:
+        key = self._key(operation, *args)
+        generation = self._generation
+        value = self._get(self._queries, key)
+        if value is _MISSING:
+            value = compute()
+            self._put(self._queries, key, value, generation)
+        return value
+
+    def save_many(self, items: List[Any]) -> int:
+        """
+        Save many items through to the wrapped repository.
+        """
+        try:
+            return self.repository.save_many(items)
+        finally:
+            identifiers = [self._identifier_of(item) for item in items]
+            if any(identifier is None for identifier in identifiers):
+                self._invalidate()
+            else:
+                self._invalidate(identifiers + [str(identifier) for identifier in identifiers])
+
+    def load_many(self, identifiers: List[Any]) -> List[Optional[Any]]:
+        """
+        Load many items, fetching only the uncached ones from the wrapped repository.
+        """
+        generation = self._generation
+        results = [self._get(self._loads, self._key(identifier)) for identifier in identifiers]
+        missing = [identifier for identifier, value in zip(identifiers, results) if value is _MISSING]
+        if missing:
+            fetched = iter(self.repository.load_many(missing))
+            for position, value in enumerate(results):
+                if value is _MISSING:
+                    results[position] = next(fetched)
+                    if results[position] is not None:
+                        self._put(self._loads, self._key(identifiers[position]), results[position], generation)
+        return results
+
+    def delete_many(self, identifiers: List[Any]) -> int:
+        """
+        Delete many items through to the wrapped repository.
+        """
+        try:
+            return self.repository.delete_many(identifiers)
+        finally:
+            if any(isinstance(identifier, dict) for identifier in identifiers):
+                self._invalidate()
+            else:
+                self._invalidate(list(identifiers) + [str(identifier) for identifier in identifiers])
+
+    def search(self, text: str, criteria: Optional[dict] = None, top_k: Optional[int] = 10) -> List[Any]:
+        """
+        Search the wrapped repository, memoized per query until the next write.
+        """
+        return self._memoized(
+            'search', (text, criteria, top_k), lambda: self.repository.search(text, criteria, top_k)
+        )
+
+    def iter_all(self, *args: Any, **kwargs: Any):
+        """
+        Stream items straight from the wrapped repository.
+        """
+        return self.repository.iter_all(*args, **kwargs)
+
+    def iter_find_by(self, *args: Any, **kwargs: Any):
+        """
+        Stream matching items straight from the wrapped repository.
+        """
+        return self.repository.iter_find_by(*args, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Hit and miss counters for the cache.
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'loads_cached': len(self._loads),
+                'queries_cached': len(self._queries)
+            }
+
+    def clear(self) -> None:
+        """
+        Empty the cache and reset its counters.
+        """
+        with self._lock:
+            self._loads.clear()
+            self._queries.clear()
+            self.hits = 0
+            self.misses = 0
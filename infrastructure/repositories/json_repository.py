@@ -1,28 +1,187 @@
 import json
 import os
-from typing import Any, List, Dict, Optional
+import time
+import threading
+from typing import Any, Iterable, Iterator, List, Dict, Optional, Set, Tuple, Union
 from base_repository import BaseRepository
+from serializers import EXTENSIONS, Serializer, decode, get_serializer
+from text_index import InvertedIndex
 
 class JSONRepository(BaseRepository):
     """
     A JSON file-based implementation of the BaseRepository abstract class.
     
     Provides generic data persistence operations using JSON files in a specified directory.
+    Parsed items are kept in a lazily built in-memory index, with hash indexes on the
+    declared fields, and re-read only when a file's modification time or size changes.
+    Items are written with a pluggable serializer (pretty JSON by default, or compact
+    JSON, msgpack and gzip/zstd-compressed variants), each under its own file extension
+    (.json, .msgpack, .json.gz, ...); reads detect the format of each file, so a store
+    can switch serializers without rewriting existing files.
+    With full_text enabled, an inverted index over item text is kept alongside
+    the hash indexes and serves search() without scanning the store.
     """
     
-    def __init__(self, db_directory: str):
+    def __init__(
+        self,
+        db_directory: str,
+        indexed_fields: Iterable[str] = (),
+        check_interval: float = 0.0,
+        serializer: Union[str, Serializer] = 'json',
+        full_text: bool = False,
+        text_fields: Optional[Iterable[str]] = None
+    ):
         """
         Initialize the JSON repository with a directory for storing JSON files.
         
         Args:
             db_directory (str): Path to the directory where JSON files will be stored
+            indexed_fields (iterable): Fields with hash indexes for equality lookups
+            check_interval (float): Minimum seconds between scans of the directory
+                                    for external changes (0 checks on every query)
+            serializer (str or Serializer): Format new files are written in, one of
+                                    'json', 'compact', 'msgpack', 'gzip', 'zstd',
+                                    'msgpack+gzip' or 'msgpack+zstd'; the file
+                                    extension follows the format
+            full_text (bool): Maintain an inverted index for search()
+            text_fields (iterable): Fields whose text is indexed (every string
+                                    in the item when None)
         """
         self.db_directory = db_directory
+        self.indexed_fields = tuple(indexed_fields)
+        self.check_interval = check_interval
+        self.serializer = get_serializer(serializer)
         os.makedirs(db_directory, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._checked_at = 0.0
+        self._items: Dict[str, Dict[str, Any]] = {}
+        self._signatures: Dict[str, Tuple[int, int]] = {}
+        self._indexes: Dict[str, Dict[Any, Set[str]]] = {field: {} for field in self.indexed_fields}
+        self._text_index = InvertedIndex(text_fields) if full_text else None
+
+    @staticmethod
+    def _index_key(value: Any) -> Any:
+        """
+        Map a field value to a hashable index key.
+        """
+        try:
+            hash(value)
+            return value
+        except TypeError:
+            return ('__json__', json.dumps(value, sort_keys=True, default=str))
+
+    def _index_item(self, key: str, item: Dict[str, Any], signature: Tuple[int, int]) -> None:
+        self._unindex_item(key)
+        self._items[key] = item
+        self._signatures[key] = signature
+        for field, index in self._indexes.items():
+            index.setdefault(self._index_key(item.get(field)), set()).add(key)
+        if self._text_index is not None:
+            self._text_index.add(key, item)
+
+    def _unindex_item(self, key: str) -> None:
+        item = self._items.pop(key, None)
+        self._signatures.pop(key, None)
+        if item is None:
+            return
+        if self._text_index is not None:
+            self._text_index.remove(key)
+        for field, index in self._indexes.items():
+            index_key = self._index_key(item.get(field))
+            keys = index.get(index_key)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del index[index_key]
+
+    @staticmethod
+    def _key_of(name: str) -> Optional[str]:
+        """
+        The item key of a file name, or None if it isn't an item file.
+        """
+        for extension in EXTENSIONS:
+            if name.endswith(extension):
+                return name[:-len(extension)]
+        return None
+
+    def _path(self, identifier: Any) -> str:
+        return os.path.join(self.db_directory, f"{identifier}{self.serializer.extension}")
+
+    def _variant_paths(self, identifier: Any) -> List[str]:
+        """
+        Paths an item may be stored under, in any format; its current format first.
+        """
+        own = self._path(identifier)
+        return [own] + [
+            os.path.join(self.db_directory, f"{identifier}{extension}")
+            for extension in EXTENSIONS if extension != self.serializer.extension
+        ]
+
+    def _remove_stale(self, identifier: Any) -> None:
+        """
+        Remove copies of an item left in another format by a previous serializer.
+        """
+        for path in self._variant_paths(identifier)[1:]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"Error removing stale file: {e}")
+
+    @staticmethod
+    def _read_file(file_path: str) -> Dict[str, Any]:
+        with open(file_path, 'rb') as file:
+            return decode(file.read())
+
+    def _write_file(self, file_path: str, data: Dict[str, Any]) -> None:
+        payload = self.serializer.dumps(data)
+        with open(file_path, 'wb') as file:
+            file.write(payload)
+
+    @staticmethod
+    def _signature(stat: os.stat_result) -> Tuple[int, int]:
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _refresh(self) -> None:
+        """
+        Bring the in-memory index in line with the directory, re-parsing only files
+        that are new or whose modification time or size changed.
+        """
+        now = time.monotonic()
+        if self._loaded and now - self._checked_at < self.check_interval:
+            return
+
+        seen = set()
+        with os.scandir(self.db_directory) as entries:
+            for entry in entries:
+                key = self._key_of(entry.name)
+                if key is None or not entry.is_file():
+                    continue
+                seen.add(key)
+                signature = self._signature(entry.stat())
+                if self._signatures.get(key) == signature:
+                    continue
+                try:
+                    self._index_item(key, self._read_file(entry.path), signature)
+                except (IOError, ValueError) as e:
+                    print(f"Error loading data: {e}")
+
+        for key in set(self._items) - seen:
+            self._unindex_item(key)
+
+        self._loaded = True
+        self._checked_at = now
     
     def save(self, data: Dict[str, Any]) -> Optional[str]:
         """
         Save data to a JSON file named after the item's identifier.
+
+        The file is written under a temporary name and renamed into place, so
+        readers never see it half written, then the directory is fsynced once
+        to make the rename durable (the same model as save_many).
         
         Args:
             data (dict): The data to be saved, expected to have an 'id' key
@@ -35,9 +194,15 @@ class JSONRepository(BaseRepository):
             raise ValueError("Data must include an 'id' field")
         
         try:
-            file_path = os.path.join(self.db_directory, f"{identifier}.json")
-            with open(file_path, 'w') as file:
-                json.dump(data, file, indent=2)
+            file_path = self._path(identifier)
+            with self._lock:
+                tmp_path = f"{file_path}.tmp"
+                self._write_file(tmp_path, data)
+                os.replace(tmp_path, file_path)
+                self._remove_stale(identifier)
+                if self._loaded:
+                    self._index_item(str(identifier), dict(data), self._signature(os.stat(file_path)))
+                self._sync_directory()
             return identifier
         except (IOError, TypeError) as e:
             print(f"Error saving data: {e}")
@@ -53,15 +218,12 @@ class JSONRepository(BaseRepository):
         Returns:
             The loaded data as a dictionary, or None if the file doesn't exist
         """
-        file_path = os.path.join(self.db_directory, f"{identifier}.json")
-        
         try:
-            if not os.path.exists(file_path):
-                return None
-            
-            with open(file_path, 'r') as file:
-                return json.load(file)
-        except (IOError, json.JSONDecodeError) as e:
+            for file_path in self._variant_paths(identifier):
+                if os.path.exists(file_path):
+                    return self._read_file(file_path)
+            return None
+        except (IOError, ValueError) as e:
             print(f"Error loading data: {e}")
             return None
     
@@ -75,17 +237,94 @@ class JSONRepository(BaseRepository):
         Returns:
             True if deletion was successful, False otherwise
         """
-        file_path = os.path.join(self.db_directory, f"{identifier}.json")
-        
         try:
-            if os.path.exists(file_path):
-                os.remove(file_path)
-                return True
-            return False
+            deleted = False
+            with self._lock:
+                self._unindex_item(str(identifier))
+                for file_path in self._variant_paths(identifier):
+                    if os.path.exists(file_path):
+                        os.remove(file_path)
+                        deleted = True
+            return deleted
         except OSError as e:
             print(f"Error deleting file: {e}")
             return False
     
+    def save_many(self, items: List[Dict[str, Any]]) -> int:
+        """
+        Save many items, writing each file atomically, with a single fsync.
+        
+        Each item is written to a temporary file and renamed over its target,
+        so a reader or a crashed writer never leaves a torn file under its
+        final name; one fsync of the directory at the end makes the renames of
+        the whole batch durable. File contents are not fsynced individually,
+        so after a power loss a file's data may still lag its rename on
+        filesystems that don't order the two.
+        
+        Args:
+            items (list): Items to be saved, each expected to have an 'id' key
+        
+        Returns:
+            The number of items saved
+        """
+        if any(item.get('id') is None for item in items):
+            raise ValueError("Data must include an 'id' field")
+        
+        saved = 0
+        with self._lock:
+            for item in items:
+                file_path = self._path(item['id'])
+                tmp_path = f"{file_path}.tmp"
+                try:
+                    self._write_file(tmp_path, item)
+                    os.replace(tmp_path, file_path)
+                    self._remove_stale(item['id'])
+                except (IOError, TypeError) as e:
+                    print(f"Error saving data: {e}")
+                    continue
+                saved += 1
+                if self._loaded:
+                    self._index_item(str(item['id']), dict(item), self._signature(os.stat(file_path)))
+            self._sync_directory()
+        return saved
+    
+    def delete_many(self, identifiers: List[str]) -> int:
+        """
+        Delete many items, syncing the directory once at the end.
+        
+        Args:
+            identifiers (list): Unique identifiers of the items to delete
+        
+        Returns:
+            The number of items deleted
+        """
+        deleted = 0
+        with self._lock:
+            for identifier in identifiers:
+                self._unindex_item(str(identifier))
+                removed = False
+                for file_path in self._variant_paths(identifier):
+                    try:
+                        os.remove(file_path)
+                        removed = True
+                    except FileNotFoundError:
+                        continue
+                    except OSError as e:
+                        print(f"Error deleting file: {e}")
+                deleted += removed
+            self._sync_directory()
+        return deleted
+    
+    def _sync_directory(self) -> None:
+        try:
+            fd = os.open(self.db_directory, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        except OSError as e:
+            print(f"Error syncing directory: {e}")
+    
     def get_all(self) -> List[Dict[str, Any]]:
         """
         Retrieve all JSON files from the directory.
@@ -93,17 +332,11 @@ class JSONRepository(BaseRepository):
         Returns:
             A list of all data items stored in JSON files
         """
-        all_data = []
-        
         try:
-            all_files = os.listdir(self.db_directory)
-            for file_name in all_files:
-                if file_name.endswith('.json'):
-                    file_path = os.path.join(self.db_directory, file_name)
-                    with open(file_path, 'r') as file:
-                        all_data.append(json.load(file))
-            return all_data
-        except (IOError, json.JSONDecodeError) as e:
+            with self._lock:
+                self._refresh()
+                return [dict(item) for item in self._items.values()]
+        except OSError as e:
             print(f"Error retrieving all data: {e}")
             return []
     
@@ -117,13 +350,142 @@ class JSONRepository(BaseRepository):
         Returns:
             A list of items matching all specified criteria
         """
-        results = []
         try:
-            all_data = self.get_all()
-            for item in all_data:
-                if all(item.get(k) == v for k, v in criteria.items()):
-                    results.append(item)
-            return results
+            with self._lock:
+                self._refresh()
+                candidates = self._candidate_keys(criteria)
+                if candidates is None:
+                    candidates = self._items.keys()
+                return [
+                    dict(self._items[key]) for key in candidates
+                    if all(self._items[key].get(k) == v for k, v in criteria.items())
+                ]
         except Exception as e:
             print(f"Error finding items: {e}")
-            return []
\ No newline at end of file
+            return []
+
+    def iter_all(
+        self,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        fields: Optional[List[str]] = None,
+        order_by: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream all items, parsing files one at a time if the index isn't built yet.
+        
+        Args:
+            limit (int): Maximum number of items to yield
+            offset (int): Number of items to skip first
+            fields (list): Fields to keep in each item (all fields when None)
+            order_by (str): Field to sort by, prefixed with '-' for descending order
+        
+        Returns:
+            An iterator over the selected items
+        """
+        return self._paginate(self._iter_items({}), limit, offset, fields, order_by)
+    
+    def iter_find_by(
+        self,
+        criteria: Dict[str, Any],
+        limit: Optional[int] = None,
+        offset: int = 0,
+        fields: Optional[List[str]] = None,
+        order_by: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream items matching specific criteria.
+        
+        Args:
+            criteria (dict): A dictionary of key-value pairs to match
+            limit (int): Maximum number of items to yield
+            offset (int): Number of matching items to skip first
+            fields (list): Fields to keep in each item (all fields when None)
+            order_by (str): Field to sort by, prefixed with '-' for descending order
+        
+        Returns:
+            An iterator over the matching items
+        """
+        return self._paginate(self._iter_items(criteria), limit, offset, fields, order_by)
+    
+    def _iter_items(self, criteria: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Yield matching items from the index when it is built, otherwise
+        straight from disk without building it.
+        """
+        def matches(item):
+            return all(item.get(k) == v for k, v in criteria.items())
+        
+        if self._loaded:
+            with self._lock:
+                self._refresh()
+                candidates = self._candidate_keys(criteria)
+                keys = list(self._items if candidates is None else candidates)
+            for key in keys:
+                item = self._items.get(key)
+                if item is not None and matches(item):
+                    yield dict(item)
+            return
+        
+        with os.scandir(self.db_directory) as entries:
+            for entry in entries:
+                if self._key_of(entry.name) is None or not entry.is_file():
+                    continue
+                try:
+                    item = self._read_file(entry.path)
+                except (IOError, ValueError) as e:
+                    print(f"Error loading data: {e}")
+                    continue
+                if matches(item):
+                    yield item
+
+    def search(
+        self,
+        text: str,
+        criteria: Optional[Dict[str, Any]] = None,
+        top_k: Optional[int] = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Rank items matching criteria against a free-text query with BM25.
+        
+        Uses the inverted index when full_text is enabled, touching only the
+        postings of the query terms; otherwise falls back to a scan.
+        
+        Args:
+            text (str): Free-text query
+            criteria (dict): A dictionary of key-value pairs the items must also match
+            top_k (int): Maximum number of items to return (all matches when None)
+        
+        Returns:
+            Items containing any query term, most relevant first
+        """
+        if self._text_index is None:
+            return super().search(text, criteria, top_k)
+        
+        with self._lock:
+            self._refresh()
+            candidates = None
+            if criteria:
+                keys = self._candidate_keys(criteria)
+                candidates = {
+                    key for key in (self._items if keys is None else keys)
+                    if all(self._items[key].get(k) == v for k, v in criteria.items())
+                }
+            ranked = self._text_index.search(text, top_k, candidates)
+            return [dict(self._items[key]) for key, _ in ranked]
+
+    def _candidate_keys(self, criteria: Dict[str, Any]) -> Optional[Set[str]]:
+        """
+        Intersect the hash indexes covering the criteria, smallest first.
+
+        Returns:
+            Keys of items that may match, or None if no criterion is indexed
+        """
+        matches = sorted(
+            (self._indexes[field].get(self._index_key(value), set())
+             for field, value in criteria.items() if field in self._indexes),
+            key=len
+        )
+        if not matches:
+            return None
+        return set(matches[0]).intersection(*matches[1:])
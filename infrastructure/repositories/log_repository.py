@@ -0,0 +1,520 @@
+import json
+import os
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from base_repository import BaseRepository
+
+# (segment number, byte offset, record length)
+Location = Tuple[int, int, int]
+
+
+class LogStructuredRepository(BaseRepository):
+    """
+    An append-only, log-structured implementation of the BaseRepository abstract class.
+
+    Records are appended as JSON lines to numbered segment files and located through an
+    in-memory offset index mapping each id to its latest record. Superseded records and
+    tombstones are reclaimed by compaction. On startup the index is rebuilt by replaying
+    the segments, and a torn trailing write from a crash is truncated away.
+    """
+
+    SEGMENT_PREFIX = 'segment-'
+    SEGMENT_SUFFIX = '.jsonl'
+    COMPACT_SUFFIX = '.compact'
+    # Records an in-progress swap of compaction output, so recovery can finish it
+    COMPACTION_MARKER = 'COMPACTION'
+
+    def __init__(
+        self,
+        db_directory: str,
+        max_segment_bytes: int = 64 * 1024 * 1024,
+        sync: bool = True,
+        compaction_interval: Optional[float] = None,
+        compaction_threshold: float = 0.5
+    ):
+        """
+        Initialize the repository, recovering the index from existing segments.
+
+        Args:
+            db_directory (str): Path to the directory holding the segment files
+            max_segment_bytes (int): Size at which the active segment is sealed
+            sync (bool): fsync after every write for crash durability
+            compaction_interval (float): Seconds between background compaction checks
+                                         (no background compaction when None)
+            compaction_threshold (float): Fraction of dead records that triggers compaction
+        """
+        self.db_directory = db_directory
+        self.max_segment_bytes = max_segment_bytes
+        self.sync = sync
+        self.compaction_interval = compaction_interval
+        self.compaction_threshold = compaction_threshold
+        os.makedirs(db_directory, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._compaction_lock = threading.Lock()
+        self._index: Dict[str, Location] = {}
+        self._segment_records: Dict[int, int] = {}
+        self._readers: Dict[int, Any] = {}
+        self._recover()
+
+        self._active = max(self._segment_records)
+        self._writer = open(self._segment_path(self._active), 'ab')
+
+        self._stop = threading.Event()
+        self._compactor = None
+        if compaction_interval:
+            self._compactor = threading.Thread(target=self._compaction_loop, daemon=True)
+            self._compactor.start()
+
+    def _segment_path(self, number: int) -> str:
+        return os.path.join(self.db_directory, f"{self.SEGMENT_PREFIX}{number:06d}{self.SEGMENT_SUFFIX}")
+
+    def _recover(self) -> None:
+        """
+        Rebuild the offset index by replaying every segment in order.
+        """
+        self._finish_compaction()
+
+        numbers = []
+        for name in os.listdir(self.db_directory):
+            if name.endswith(self.COMPACT_SUFFIX):
+                # Output of a compaction that never got swapped in
+                os.remove(os.path.join(self.db_directory, name))
+            elif name.startswith(self.SEGMENT_PREFIX) and name.endswith(self.SEGMENT_SUFFIX):
+                numbers.append(int(name[len(self.SEGMENT_PREFIX):-len(self.SEGMENT_SUFFIX)]))
+        numbers.sort()
+
+        if not numbers:
+            open(self._segment_path(1), 'ab').close()
+            numbers = [1]
+
+        for number in numbers:
+            self._segment_records[number] = 0
+            self._replay(number, is_last=number == numbers[-1])
+
+    def _finish_compaction(self) -> None:
+        """
+        Complete or undo a compaction interrupted by a crash.
+
+        If the marker's compaction output was never swapped in, the old
+        segments are intact and the output is discarded. Otherwise the swap
+        happened, and the older segments it replaced are removed; replaying
+        them would resurrect items whose tombstones were compacted away.
+        """
+        marker_path = os.path.join(self.db_directory, self.COMPACTION_MARKER)
+        try:
+            with open(marker_path, 'r') as file:
+                marker = json.load(file)
+        except FileNotFoundError:
+            return
+        except ValueError:
+            # A torn marker was never complete, so nothing was swapped in yet
+            os.remove(marker_path)
+            return
+
+        compact_path = self._segment_path(marker['target']) + self.COMPACT_SUFFIX
+        if not os.path.exists(compact_path):
+            for number in marker['remove']:
+                try:
+                    os.remove(self._segment_path(number))
+                except FileNotFoundError:
+                    pass
+            self._sync_directory()
+        os.remove(marker_path)
+
+    def _sync_directory(self) -> None:
+        fd = os.open(self.db_directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _replay(self, number: int, is_last: bool) -> None:
+        path = self._segment_path(number)
+        offset = 0
+        with open(path, 'rb') as file:
+            for line in file:
+                try:
+                    if not line.endswith(b'\n'):
+                        raise ValueError("incomplete record")
+                    record = json.loads(line)
+                except ValueError as e:
+                    if is_last:
+                        # A crash interrupted the final append; drop the torn tail
+                        print(f"Truncating torn record in {path} at offset {offset}: {e}")
+                        break
+                    print(f"Skipping corrupt record in {path} at offset {offset}: {e}")
+                    offset += len(line)
+                    continue
+                self._apply(record, (number, offset, len(line)))
+                offset += len(line)
+
+        if is_last and offset != os.path.getsize(path):
+            with open(path, 'r+b') as file:
+                file.truncate(offset)
+
+    def _apply(self, record: Dict[str, Any], location: Location) -> None:
+        key = str(record['id'])
+        if record.get('deleted'):
+            self._index.pop(key, None)
+        else:
+            self._index[key] = location
+        self._segment_records[location[0]] += 1
+
+    def _append(self, records: List[Dict[str, Any]]) -> None:
+        """
+        Append records to the active segment with a single write and fsync,
+        then apply them to the index.
+        """
+        lines = [(json.dumps(record, separators=(',', ':')) + '\n').encode('utf-8') for record in records]
+        offset = self._writer.tell()
+        self._writer.write(b''.join(lines))
+        self._writer.flush()
+        if self.sync:
+            os.fsync(self._writer.fileno())
+
+        for record, line in zip(records, lines):
+            self._apply(record, (self._active, offset, len(line)))
+            offset += len(line)
+        if offset >= self.max_segment_bytes:
+            self._roll()
+
+    def _roll(self) -> None:
+        """
+        Seal the active segment and start a new one.
+        """
+        self._writer.close()
+        self._active += 1
+        self._segment_records[self._active] = 0
+        self._writer = open(self._segment_path(self._active), 'ab')
+
+    def _read(self, location: Location) -> Dict[str, Any]:
+        number, offset, length = location
+        reader = self._readers.get(number)
+        if reader is None:
+            reader = self._readers[number] = open(self._segment_path(number), 'rb')
+        reader.seek(offset)
+        return json.loads(reader.read(length))
+
+    def _iter_live(self) -> Iterator[Dict[str, Any]]:
+        with self._lock:
+            # Read in file order for sequential I/O
+            keys = [key for _, key in sorted((location, key) for key, location in self._index.items())]
+        for key in keys:
+            # Re-resolve each key so concurrent writes and compaction are respected
+            with self._lock:
+                location = self._index.get(key)
+                if location is None:
+                    continue
+                item = self._read(location)['data']
+            yield item
+
+    def save(self, data: Dict[str, Any]) -> Optional[str]:
+        """
+        Append a record for the item, superseding any earlier version.
+
+        Args:
+            data (dict): The data to be saved, expected to have an 'id' key
+
+        Returns:
+            The identifier of the saved item, or None if saving failed
+        """
+        identifier = data.get('id')
+        if identifier is None:
+            raise ValueError("Data must include an 'id' field")
+
+        try:
+            with self._lock:
+                self._append([{'id': identifier, 'data': data}])
+            return identifier
+        except (IOError, TypeError) as e:
+            print(f"Error saving data: {e}")
+            return None
+
+    def load(self, identifier: str) -> Optional[Dict[str, Any]]:
+        """
+        Load the latest version of an item through the offset index.
+
+        Args:
+            identifier (str): The unique identifier of the item to load
+
+        Returns:
+            The loaded data as a dictionary, or None if it doesn't exist
+        """
+        try:
+            with self._lock:
+                location = self._index.get(str(identifier))
+                if location is None:
+                    return None
+                return self._read(location)['data']
+        except (IOError, json.JSONDecodeError) as e:
+            print(f"Error loading data: {e}")
+            return None
+
+    def delete(self, identifier: str) -> bool:
+        """
+        Append a tombstone for an item.
+
+        Args:
+            identifier (str): The unique identifier of the item to delete
+
+        Returns:
+            True if deletion was successful, False otherwise
+        """
+        try:
+            with self._lock:
+                if str(identifier) not in self._index:
+                    return False
+                self._append([{'id': identifier, 'deleted': True}])
+                return True
+        except IOError as e:
+            print(f"Error deleting data: {e}")
+            return False
+
+    def save_many(self, items: List[Dict[str, Any]]) -> int:
+        """
+        Append records for many items with a single write and fsync.
+
+        Args:
+            items (list): Items to be saved, each expected to have an 'id' key
+
+        Returns:
+            The number of items saved
+        """
+        if any(item.get('id') is None for item in items):
+            raise ValueError("Data must include an 'id' field")
+
+        try:
+            with self._lock:
+                self._append([{'id': item['id'], 'data': item} for item in items])
+            return len(items)
+        except (IOError, TypeError) as e:
+            print(f"Error saving data: {e}")
+            return 0
+
+    def load_many(self, identifiers: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Load many items, reading them in file order.
+
+        Args:
+            identifiers (list): Unique identifiers of the items to load
+
+        Returns:
+            The loaded items in the order of identifiers, with None for missing ones
+        """
+        try:
+            with self._lock:
+                locations = {str(i): self._index.get(str(i)) for i in identifiers}
+                loaded = {
+                    key: self._read(location)['data']
+                    for key, location in sorted(locations.items(), key=lambda entry: entry[1] or ())
+                    if location is not None
+                }
+            return [loaded.get(str(identifier)) for identifier in identifiers]
+        except (IOError, json.JSONDecodeError) as e:
+            print(f"Error loading data: {e}")
+            return [None] * len(identifiers)
+
+    def delete_many(self, identifiers: List[str]) -> int:
+        """
+        Append tombstones for many items with a single write and fsync.
+
+        Args:
+            identifiers (list): Unique identifiers of the items to delete
+
+        Returns:
+            The number of items deleted
+        """
+        try:
+            with self._lock:
+                present = [i for i in dict.fromkeys(identifiers) if str(i) in self._index]
+                if present:
+                    self._append([{'id': identifier, 'deleted': True} for identifier in present])
+                return len(present)
+        except IOError as e:
+            print(f"Error deleting data: {e}")
+            return 0
+
+    def get_all(self) -> List[Dict[str, Any]]:
+        """
+        Retrieve the latest version of every item.
+
+        Returns:
+            A list of all live items
+        """
+        try:
+            return list(self._iter_live())
+        except (IOError, json.JSONDecodeError) as e:
+            print(f"Error retrieving all data: {e}")
+            return []
+
+    def find_by(self, criteria: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Find items matching specific criteria.
+
+        Args:
+            criteria (dict): A dictionary of key-value pairs to match
+
+        Returns:
+            A list of items matching all specified criteria
+        """
+        try:
+            return [
+                item for item in self._iter_live()
+                if all(item.get(k) == v for k, v in criteria.items())
+            ]
+        except Exception as e:
+            print(f"Error finding items: {e}")
+            return []
+
+    def iter_all(
+        self,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        fields: Optional[List[str]] = None,
+        order_by: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the latest version of every item, one record read at a time.
+
+        Args:
+            limit (int): Maximum number of items to yield
+            offset (int): Number of items to skip first
+            fields (list): Fields to keep in each item (all fields when None)
+            order_by (str): Field to sort by, prefixed with '-' for descending order
+
+        Returns:
+            An iterator over the selected items
+        """
+        return self._paginate(self._iter_live(), limit, offset, fields, order_by)
+
+    def iter_find_by(
+        self,
+        criteria: Dict[str, Any],
+        limit: Optional[int] = None,
+        offset: int = 0,
+        fields: Optional[List[str]] = None,
+        order_by: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream items matching specific criteria, one record read at a time.
+
+        Args:
+            criteria (dict): A dictionary of key-value pairs to match
+            limit (int): Maximum number of items to yield
+            offset (int): Number of matching items to skip first
+            fields (list): Fields to keep in each item (all fields when None)
+            order_by (str): Field to sort by, prefixed with '-' for descending order
+
+        Returns:
+            An iterator over the matching items
+        """
+        items = (
+            item for item in self._iter_live()
+            if all(item.get(k) == v for k, v in criteria.items())
+        )
+        return self._paginate(items, limit, offset, fields, order_by)
+
+    def garbage_ratio(self) -> float:
+        """
+        Fraction of records on disk that are superseded or tombstones.
+        """
+        with self._lock:
+            total = sum(self._segment_records.values())
+            return 1 - len(self._index) / total if total else 0.0
+
+    def compact(self) -> None:
+        """
+        Rewrite all sealed segments into one containing only live records.
+
+        The active segment is sealed first. Before the compacted output replaces
+        the newest sealed segment via an atomic rename, a marker listing the
+        older segments is made durable; recovery uses it to finish removing
+        them (or to discard output that was never swapped in), so a crash at
+        any point replays to the same state. Only one compaction runs at a time.
+        """
+        with self._compaction_lock:
+            self._compact()
+
+    def _compact(self) -> None:
+        with self._lock:
+            self._roll()
+            sealed = sorted(n for n in self._segment_records if n != self._active)
+            target = sealed[-1]
+            live = sorted((location, key) for key, location in self._index.items() if location[0] <= target)
+
+        # Sealed segments are immutable, so they can be copied without the lock
+        compact_path = self._segment_path(target) + self.COMPACT_SUFFIX
+        relocated = {}
+        sources = {}
+        try:
+            with open(compact_path, 'wb') as out:
+                for (number, offset, length), key in live:
+                    source = sources.get(number)
+                    if source is None:
+                        source = sources[number] = open(self._segment_path(number), 'rb')
+                    source.seek(offset)
+                    relocated[key] = (target, out.tell(), length)
+                    out.write(source.read(length))
+                out.flush()
+                os.fsync(out.fileno())
+        finally:
+            for source in sources.values():
+                source.close()
+
+        marker_path = os.path.join(self.db_directory, self.COMPACTION_MARKER)
+        with open(marker_path, 'w') as marker:
+            json.dump({'target': target, 'remove': sealed[:-1]}, marker)
+            marker.flush()
+            os.fsync(marker.fileno())
+        self._sync_directory()
+
+        with self._lock:
+            for number in sealed:
+                reader = self._readers.pop(number, None)
+                if reader is not None:
+                    reader.close()
+
+            os.replace(compact_path, self._segment_path(target))
+            self._sync_directory()
+            for number in sealed[:-1]:
+                os.remove(self._segment_path(number))
+                del self._segment_records[number]
+            self._sync_directory()
+            os.remove(marker_path)
+            self._segment_records[target] = len(relocated)
+
+            for key, location in relocated.items():
+                # Skip items rewritten or deleted while compaction was running
+                current = self._index.get(key)
+                if current is not None and current[0] <= target:
+                    self._index[key] = location
+
+    def _compaction_loop(self) -> None:
+        while not self._stop.wait(self.compaction_interval):
+            if self.garbage_ratio() < self.compaction_threshold:
+                continue
+            try:
+                self.compact()
+            except OSError as e:
+                print(f"Error compacting segments: {e}")
+
+    def close(self) -> None:
+        """
+        Stop background compaction and close all segment files.
+        """
+        self._stop.set()
+        if self._compactor is not None:
+            self._compactor.join()
+        with self._lock:
+            self._writer.close()
+            for reader in self._readers.values():
+                reader.close()
+            self._readers.clear()
+
+    def __del__(self):
+        """
+        Ensure the segment files are closed when the object is deleted.
+        """
+        if hasattr(self, '_writer') and not self._writer.closed:
+            self.close()
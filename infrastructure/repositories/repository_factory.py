@@ -1,7 +1,11 @@
-from typing import Literal, Union
+from typing import Literal, Optional
 from sql_repository import SQLRepository
 from json_repository import JSONRepository
+from log_repository import LogStructuredRepository
 from base_repository import BaseRepository
+from cached_repository import CachedRepository
+from write_behind import WriteBehindRepository
+from snapshot_repository import SnapshotRepository
 
 class RepositoryFactory:
     """
@@ -13,26 +17,59 @@ class RepositoryFactory:
     
     @staticmethod
     def create_repo(
-        repo_type: Literal["SQL", "JSON"], 
-        db_location: str
-    ) -> Union[SQLRepository, JSONRepository]:
+        repo_type: Literal["SQL", "JSON", "LOG", "SNAPSHOT"], 
+        db_location: str,
+        cached: bool = False,
+        cache_size: int = 1024,
+        cache_ttl: Optional[float] = None,
+        write_behind: bool = False,
+        flush_interval: float = 1.0,
+        max_batch: int = 500,
+        **options
+    ) -> BaseRepository:
         """
         Create a repository instance based on the specified type.
         
         Args:
             repo_type (str): Type of repository to create. 
-                              Must be either "SQL" or "JSON".
-            db_location (str): Path to the database or directory
+                              Must be "SQL", "JSON", "LOG" (append-only segments)
+                              or "SNAPSHOT" (read-only, memory-mapped).
+            db_location (str): Path to the database, directory or snapshot file
+            cached (bool): Wrap the repository in a read-through CachedRepository
+            cache_size (int): Maximum entries kept in each cache
+            cache_ttl (float): Seconds a cached entry stays valid (no expiry when None)
+            write_behind (bool): Queue writes and flush them in the background
+            flush_interval (float): Seconds before queued writes are flushed
+            max_batch (int): Number of queued writes that triggers an immediate flush
+            **options: Backend-specific constructor options
+                       (e.g. tuned=True for SQL, indexed_fields for JSON, or
+                       serializer='compact'/'msgpack'/'gzip'/'zstd' to choose the
+                       JSON repository's storage format and file extension)
         
         Returns:
-            A repository instance (SQLRepository or JSONRepository)
+            A repository instance (SQLRepository, JSONRepository, LogStructuredRepository
+            or SnapshotRepository),
+            behind a WriteBehindRepository when write_behind is True and wrapped in a
+            CachedRepository when cached is True
         
         Raises:
             ValueError: If an unknown repository type is provided
         """
         if repo_type == "SQL":
-            return SQLRepository(db_path=db_location)
+            repository = SQLRepository(db_path=db_location, **options)
         elif repo_type == "JSON":
-            return JSONRepository(db_directory=db_location)
+            repository = JSONRepository(db_directory=db_location, **options)
+        elif repo_type == "LOG":
+            repository = LogStructuredRepository(db_directory=db_location, **options)
+        elif repo_type == "SNAPSHOT":
+            repository = SnapshotRepository(snapshot_path=db_location, **options)
         else:
-            raise ValueError(f"Unknown repository type: {repo_type}")
\ No newline at end of file
+            raise ValueError(f"Unknown repository type: {repo_type}")
+        
+        if write_behind:
+            repository = WriteBehindRepository(
+                repository, flush_interval=flush_interval, max_batch=max_batch
+            )
+        if cached:
+            return CachedRepository(repository, max_entries=cache_size, ttl=cache_ttl)
+        return repository
\ No newline at end of file
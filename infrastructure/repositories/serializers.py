@@ -0,0 +1,177 @@
+import gzip
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Union
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+GZIP_MAGIC = b'\x1f\x8b'
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+JSON_START = frozenset(b' \t\r\n{["-0123456789tfn')
+# File extensions of every format, longest first so suffixes match greedily
+EXTENSIONS = ('.msgpack.gz', '.msgpack.zst', '.json.gz', '.json.zst', '.msgpack', '.json')
+
+
+class Serializer(ABC):
+    """
+    Converts repository items to and from bytes.
+
+    Subclasses implement dumps; loads accepts any supported format, so files
+    written with different serializers can be read back by any of them.
+    """
+
+    name = 'base'
+    extension = '.json'
+
+    @abstractmethod
+    def dumps(self, data: Dict[str, Any]) -> bytes:
+        """
+        Encode an item.
+
+        Args:
+            data (dict): The item to encode
+
+        Returns:
+            The encoded bytes
+        """
+        pass
+
+    def loads(self, payload: bytes) -> Any:
+        return decode(payload)
+
+
+class JSONSerializer(Serializer):
+    """
+    JSON text, pretty-printed by default to match files written so far.
+    """
+
+    name = 'json'
+
+    def __init__(self, indent: Union[int, None] = 2):
+        self.indent = indent
+        self.separators = None if indent else (',', ':')
+
+    def dumps(self, data: Dict[str, Any]) -> bytes:
+        return json.dumps(data, indent=self.indent, separators=self.separators).encode('utf-8')
+
+
+class MsgpackSerializer(Serializer):
+    """
+    Binary msgpack encoding (requires the msgpack package).
+    """
+
+    name = 'msgpack'
+    extension = '.msgpack'
+
+    def __init__(self):
+        if msgpack is None:
+            raise ImportError("The msgpack serializer requires the 'msgpack' package")
+
+    def dumps(self, data: Dict[str, Any]) -> bytes:
+        return msgpack.packb(data, use_bin_type=True)
+
+
+class CompressedSerializer(Serializer):
+    """
+    Compresses the output of another serializer with gzip or zstd
+    (zstd requires the zstandard package).
+    """
+
+    def __init__(self, inner: Serializer, codec: str = 'gzip', level: int = 3):
+        if codec not in ('gzip', 'zstd'):
+            raise ValueError(f"Unknown compression codec: {codec}")
+        if codec == 'zstd' and zstandard is None:
+            raise ImportError("The zstd serializer requires the 'zstandard' package")
+        self.inner = inner
+        self.codec = codec
+        self.level = level
+        self.name = codec if inner.name == 'compact' else f"{inner.name}+{codec}"
+        self.extension = inner.extension + ('.zst' if codec == 'zstd' else '.gz')
+
+    def dumps(self, data: Dict[str, Any]) -> bytes:
+        payload = self.inner.dumps(data)
+        if self.codec == 'zstd':
+            return zstandard.ZstdCompressor(level=self.level).compress(payload)
+        # mtime=0 keeps the output identical for identical items
+        return gzip.compress(payload, compresslevel=self.level, mtime=0)
+
+
+def _compact() -> Serializer:
+    serializer = JSONSerializer(indent=None)
+    serializer.name = 'compact'
+    return serializer
+
+
+SERIALIZERS = {
+    'json': JSONSerializer,
+    'compact': _compact,
+    'msgpack': MsgpackSerializer,
+    'gzip': lambda: CompressedSerializer(_compact(), 'gzip'),
+    'zstd': lambda: CompressedSerializer(_compact(), 'zstd'),
+    'msgpack+gzip': lambda: CompressedSerializer(MsgpackSerializer(), 'gzip'),
+    'msgpack+zstd': lambda: CompressedSerializer(MsgpackSerializer(), 'zstd'),
+}
+
+
+def get_serializer(serializer: Union[str, Serializer]) -> Serializer:
+    """
+    Resolve a serializer name to an instance.
+
+    Args:
+        serializer: A Serializer, or one of the names in SERIALIZERS
+
+    Returns:
+        The serializer instance
+
+    Raises:
+        ValueError: If the name is unknown
+        ImportError: If the serializer needs a package that isn't installed
+    """
+    if isinstance(serializer, Serializer):
+        return serializer
+    try:
+        factory = SERIALIZERS[serializer]
+    except KeyError:
+        raise ValueError(f"Unknown serializer: {serializer}") from None
+    return factory()
+
+
+def decode(payload: bytes) -> Any:
+    """
+    Decode a payload written by any serializer, detecting the format from its
+    leading bytes.
+
+    Args:
+        payload (bytes): The stored bytes
+
+    Returns:
+        The decoded item
+
+    Raises:
+        ValueError: If the payload is empty or can't be decoded
+        ImportError: If decoding needs a package that isn't installed
+    """
+    if not payload:
+        raise ValueError("Empty payload")
+    if payload.startswith(GZIP_MAGIC):
+        return decode(gzip.decompress(payload))
+    if payload.startswith(ZSTD_MAGIC):
+        if zstandard is None:
+            raise ImportError("Reading zstd data requires the 'zstandard' package")
+        try:
+            return decode(zstandard.ZstdDecompressor().decompress(payload, max_output_size=1 << 31))
+        except zstandard.ZstdError as e:
+            raise ValueError(f"Invalid zstd data: {e}") from e
+    if payload[0] in JSON_START:
+        return json.loads(payload)
+    if msgpack is None:
+        raise ImportError("Reading msgpack data requires the 'msgpack' package")
+    return msgpack.unpackb(payload, raw=False)
@@ -0,0 +1,226 @@
+import os
+import json
+import mmap
+import struct
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from base_repository import BaseRepository
+
+MAGIC = b'FLRSNAP1'
+# Index offset and length, followed by the magic again
+FOOTER = struct.Struct('<QQ8s')
+
+
+def _value_key(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+def write_snapshot(
+    items: Iterable[Dict[str, Any]],
+    path: str,
+    indexed_fields: Iterable[str] = ()
+) -> int:
+    """
+    Write items to a single indexed snapshot file.
+
+    The file holds the magic header, each item as compact JSON, then a JSON
+    index of item offsets and of ids per value of every indexed field, and a
+    fixed-size footer locating the index. It is written to a temporary file
+    and renamed into place, so readers never see a partial snapshot and
+    processes still mapping the previous one keep a consistent view.
+
+    Args:
+        items (iterable): Items to store, each expected to have an 'id' key
+        path (str): Destination file
+        indexed_fields (iterable): Fields with an index for equality lookups
+
+    Returns:
+        The number of items written
+    """
+    indexed_fields = tuple(indexed_fields)
+    # A later copy of the same id replaces the earlier one, as with save()
+    offsets: Dict[str, Tuple[int, int]] = {}
+    values: Dict[str, Tuple[str, ...]] = {}
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as file:
+        file.write(MAGIC)
+        position = len(MAGIC)
+        for item in items:
+            if item.get('id') is None:
+                raise ValueError("Data must include an 'id' field")
+            key = str(item['id'])
+            record = json.dumps(item, separators=(',', ':')).encode('utf-8')
+            file.write(record)
+            offsets[key] = (position, len(record))
+            values[key] = tuple(_value_key(item.get(field)) for field in indexed_fields)
+            position += len(record)
+
+        fields: Dict[str, Dict[str, List[str]]] = {field: {} for field in indexed_fields}
+        for key, keys in values.items():
+            for field, value_key in zip(indexed_fields, keys):
+                fields[field].setdefault(value_key, []).append(key)
+        index = json.dumps({'ids': offsets, 'fields': fields}, separators=(',', ':')).encode('utf-8')
+        file.write(index)
+        file.write(FOOTER.pack(position, len(index), MAGIC))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+    return len(offsets)
+
+
+class SnapshotRepository(BaseRepository):
+    """
+    A read-only repository served from a memory-mapped snapshot file.
+
+    Snapshots are written with write_snapshot() or BaseRepository.freeze().
+    Only the small offset index is parsed up front; items are decoded from
+    their slice of the mapping on demand, so any number of processes can
+    share one page-cached copy of the store. Writes raise RuntimeError.
+    """
+
+    def __init__(self, snapshot_path: str):
+        """
+        Open a snapshot file.
+
+        Args:
+            snapshot_path (str): Path of a file written by write_snapshot()
+
+        Raises:
+            ValueError: If the file is not a snapshot
+        """
+        self.snapshot_path = snapshot_path
+        self._lock = threading.Lock()
+        with open(snapshot_path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        size = len(self._mmap)
+        if size < len(MAGIC) + FOOTER.size or self._mmap[:len(MAGIC)] != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"Not a snapshot file: {snapshot_path}")
+        index_offset, index_length, magic = FOOTER.unpack_from(self._mmap, size - FOOTER.size)
+        if magic != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"Truncated snapshot file: {snapshot_path}")
+
+        index = self._decode(index_offset, index_length)
+        self._offsets: Dict[str, List[int]] = index['ids']
+        self._fields: Dict[str, Dict[str, List[str]]] = index['fields']
+        self.indexed_fields = tuple(self._fields)
+
+    def _decode(self, offset: int, length: int) -> Any:
+        # Slicing the mmap itself would copy the bytes out first; decode the
+        # text straight from a view of the mapping instead
+        with memoryview(self._mmap) as view:
+            return json.loads(str(view[offset:offset + length], 'utf-8'))
+
+    def _read(self, key: str) -> Dict[str, Any]:
+        offset, length = self._offsets[key]
+        return self._decode(offset, length)
+
+    def _read_only(self, *args: Any) -> Any:
+        raise RuntimeError(f"Snapshot repository {self.snapshot_path} is read-only")
+
+    save = delete = save_many = delete_many = _read_only
+
+    def load(self, identifier: Any) -> Optional[Dict[str, Any]]:
+        """
+        Load an item by its identifier.
+
+        Args:
+            identifier: The unique identifier of the item to load
+
+        Returns:
+            The item, or None if it isn't in the snapshot
+        """
+        key = str(identifier)
+        if key not in self._offsets:
+            return None
+        return self._read(key)
+
+    def get_all(self) -> List[Dict[str, Any]]:
+        """
+        Retrieve all items in the snapshot.
+        """
+        return list(self._iter_items({}))
+
+    def find_by(self, criteria: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Find items matching criteria, using the snapshot's field indexes
+        to decode only candidate items when a criterion is indexed.
+
+        Args:
+            criteria (dict): A dictionary of key-value pairs to match
+
+        Returns:
+            A list of items matching all specified criteria
+        """
+        return list(self._iter_items(criteria))
+
+    def iter_all(
+        self,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        fields: Optional[List[str]] = None,
+        order_by: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream all items, decoding them one at a time.
+        """
+        return self._paginate(self._iter_items({}), limit, offset, fields, order_by)
+
+    def iter_find_by(
+        self,
+        criteria: Dict[str, Any],
+        limit: Optional[int] = None,
+        offset: int = 0,
+        fields: Optional[List[str]] = None,
+        order_by: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream items matching specific criteria, decoding them one at a time.
+        """
+        return self._paginate(self._iter_items(criteria), limit, offset, fields, order_by)
+
+    def _iter_items(self, criteria: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        candidates = self._candidate_keys(criteria)
+        keys = self._offsets if candidates is None else sorted(candidates, key=lambda key: self._offsets[key][0])
+        for key in keys:
+            item = self._read(key)
+            if all(item.get(k) == v for k, v in criteria.items()):
+                yield item
+
+    def _candidate_keys(self, criteria: Dict[str, Any]) -> Optional[set]:
+        """
+        Intersect the field indexes covering the criteria, smallest first.
+
+        Returns:
+            Keys of items that may match, or None if no criterion is indexed
+        """
+        matches = sorted(
+            (self._fields[field].get(_value_key(value), [])
+             for field, value in criteria.items() if field in self._fields),
+            key=len
+        )
+        if not matches:
+            return None
+        return set(matches[0]).intersection(*matches[1:])
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def close(self) -> None:
+        """
+        Unmap the snapshot file.
+        """
+        with self._lock:
+            if not self._mmap.closed:
+                self._mmap.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
@@ -1,7 +1,36 @@
+import time
+import queue
 import sqlite3
-from typing import Any, List, Dict, Optional
+import threading
+from collections import Counter, deque
+from concurrent.futures import Future
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import groupby
+from typing import Any, Callable, Iterator, List, Dict, Optional, Tuple
 from base_repository import BaseRepository
 
+# SQLite's default limit on bound parameters per statement
+MAX_VARIABLES = 999
+
+
+@lru_cache(maxsize=256)
+def _insert_sql(table: str, columns: Tuple[str, ...]) -> str:
+    placeholders = ', '.join(['?'] * len(columns))
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+
+
+@lru_cache(maxsize=256)
+def _select_sql(table: str, columns: Tuple[str, ...]) -> str:
+    where_clause = " AND ".join([f"{k} = ?" for k in columns])
+    return f"SELECT * FROM {table} WHERE {where_clause}"
+
+
+@lru_cache(maxsize=256)
+def _delete_sql(table: str, key: str) -> str:
+    return f"DELETE FROM {table} WHERE {key} = ?"
+
+
 class SQLRepository(BaseRepository):
     """
     A SQLite implementation of the BaseRepository abstract class.
@@ -9,16 +38,250 @@ class SQLRepository(BaseRepository):
     Provides generic database operations for SQLite databases.
     """
     
-    def __init__(self, db_path: str):
+    def __init__(
+        self,
+        db_path: str,
+        tuned: bool = False,
+        synchronous: str = "NORMAL",
+        mmap_size: int = 256 * 1024 * 1024,
+        cache_size_kb: int = 64 * 1024,
+        statement_cache_size: int = 256,
+        pooled: bool = False,
+        busy_timeout: float = 5.0,
+        auto_index: bool = False,
+        slow_query_threshold: Optional[float] = None
+    ):
         """
         Initialize the SQLite repository with a database connection.
         
+        In pooled mode every thread reads through its own connection, and all
+        writes are queued to a single writer thread that owns the only write
+        connection, so worker threads can share one repository safely. The
+        database runs in WAL mode so readers proceed while the writer commits.
+        
         Args:
             db_path (str): Path to the SQLite database file
+            tuned (bool): Apply the performance profile (WAL journal plus the pragmas below)
+            synchronous (str): PRAGMA synchronous level used by the performance profile
+            mmap_size (int): Bytes of the database file to memory-map in the performance profile
+            cache_size_kb (int): Page cache size in KiB used by the performance profile
+            statement_cache_size (int): Number of prepared statements kept per connection
+            pooled (bool): Use per-thread reader connections and a single-writer queue
+            busy_timeout (float): Seconds a connection waits on a locked database
+            auto_index (bool): Create an index for each new column combination as soon as
+                               find_by/load queries on it
+            slow_query_threshold (float): Seconds above which a query's plan is recorded
+                                          in slow_queries (disabled when None)
         """
+        if pooled and db_path == ":memory:":
+            raise ValueError("Pooled mode needs a database file shared by all connections")
+        
         self.db_path = db_path
-        self.connection = sqlite3.connect(db_path)
-        self.cursor = self.connection.cursor()
+        self.tuned = tuned
+        self.synchronous = synchronous
+        self.mmap_size = mmap_size
+        self.cache_size_kb = cache_size_kb
+        self.statement_cache_size = statement_cache_size
+        self.pooled = pooled
+        self.busy_timeout = busy_timeout
+        self.auto_index = auto_index
+        self.slow_query_threshold = slow_query_threshold
+        self.slow_queries = deque(maxlen=100)
+        self._transaction_depth = 0
+        # Thread running the outermost transaction() block
+        self._transaction_owner = None
+        self._write_lock = threading.RLock()
+        self._stats_lock = threading.Lock()
+        self._query_columns: Counter = Counter()
+        self._indexed_columns = set()
+        # Auto-index combinations first queried inside transaction(), created once it ends
+        self._deferred_indexes = set()
+        
+        if pooled:
+            self.connection = None
+            self.cursor = None
+            self._local = threading.local()
+            self._reader_connections = []
+            self._readers_lock = threading.Lock()
+            self._write_queue = queue.Queue()
+            self._write_connection = None
+            self._writer = threading.Thread(target=self._writer_loop, daemon=True)
+            self._writer.start()
+        else:
+            self.connection = self._connect()
+            self.cursor = self.connection.cursor()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Open a connection configured with the repository's pragmas.
+        """
+        # Pooled connections stay on their own thread but may be closed from another
+        connection = sqlite3.connect(
+            self.db_path,
+            timeout=self.busy_timeout,
+            cached_statements=self.statement_cache_size,
+            check_same_thread=not self.pooled
+        )
+        self._configure(connection)
+        return connection
+    
+    def _configure(self, connection: sqlite3.Connection) -> None:
+        if self.tuned:
+            if self.synchronous.upper() not in ("OFF", "NORMAL", "FULL", "EXTRA"):
+                raise ValueError(f"Unknown synchronous level: {self.synchronous}")
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(f"PRAGMA synchronous={self.synchronous.upper()}")
+            connection.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+            connection.execute(f"PRAGMA cache_size=-{int(self.cache_size_kb)}")
+            connection.execute("PRAGMA temp_store=MEMORY")
+        elif self.pooled:
+            connection.execute("PRAGMA journal_mode=WAL")
+    
+    def apply_performance_profile(
+        self,
+        synchronous: str = "NORMAL",
+        mmap_size: int = 256 * 1024 * 1024,
+        cache_size_kb: int = 64 * 1024
+    ) -> None:
+        """
+        Switch to WAL journaling and throughput-oriented pragmas.
+        
+        With WAL, synchronous=NORMAL only fsyncs at checkpoints, so a commit
+        no longer costs an fsync while the database stays consistent on crash.
+        In pooled mode the profile applies to connections opened afterwards.
+        
+        Args:
+            synchronous (str): One of OFF, NORMAL, FULL or EXTRA
+            mmap_size (int): Bytes of the database file to memory-map
+            cache_size_kb (int): Page cache size in KiB
+        """
+        self.tuned = True
+        self.synchronous = synchronous
+        self.mmap_size = mmap_size
+        self.cache_size_kb = cache_size_kb
+        if self.connection is not None:
+            self._configure(self.connection)
+    
+    def _reader(self) -> sqlite3.Connection:
+        """
+        Connection for reads: the calling thread's own one in pooled mode.
+        
+        Inside its own transaction() block a thread reads on the write
+        connection instead, so it sees the block's uncommitted writes. The
+        writer thread is idle then but for the block's own writes, which the
+        thread waits on, so the connection is never used from both at once.
+        """
+        if not self.pooled:
+            return self.connection
+        if self._transaction_owner == threading.get_ident():
+            return self._write_connection
+        
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._local.connection = self._connect()
+            with self._readers_lock:
+                self._reader_connections.append(connection)
+        return connection
+    
+    def _writer_loop(self) -> None:
+        """
+        Run queued writes one at a time on the single write connection.
+        """
+        connection = self._write_connection = self._connect()
+        while True:
+            task = self._write_queue.get()
+            if task is None:
+                break
+            operation, future = task
+            try:
+                future.set_result(operation(connection))
+            except BaseException as e:
+                future.set_exception(e)
+        connection.close()
+    
+    def _write(self, operation: Callable[[sqlite3.Connection], Any]) -> Any:
+        """
+        Run a write operation on the write connection and return its result.
+        
+        The write lock keeps other threads' writes out of an open transaction.
+        """
+        with self._write_lock:
+            if not self.pooled:
+                return operation(self.connection)
+            future = Future()
+            self._write_queue.put((operation, future))
+            return future.result()
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Group writes into a single commit.
+        
+        Writes inside the block are committed together when it exits and
+        rolled back if it raises. Nested blocks use savepoints, so an inner
+        failure only undoes the inner block's writes. In pooled mode other
+        threads' writes wait until the block exits and their reads only see
+        the block's writes once they are committed; reads made inside the
+        block see them straight away.
+        
+        Yields:
+            The repository itself
+        """
+        with self._write_lock:
+            depth = self._transaction_depth
+            savepoint = f"repository_savepoint_{depth}"
+            
+            def begin(connection):
+                if depth > 0:
+                    connection.execute(f"SAVEPOINT {savepoint}")
+                elif not connection.in_transaction:
+                    connection.execute("BEGIN")
+            
+            def rollback(connection):
+                if depth == 0:
+                    connection.rollback()
+                else:
+                    connection.execute(f"ROLLBACK TO {savepoint}")
+                    connection.execute(f"RELEASE {savepoint}")
+            
+            def commit(connection):
+                if depth == 0:
+                    connection.commit()
+                else:
+                    connection.execute(f"RELEASE {savepoint}")
+            
+            self._write(begin)
+            self._transaction_depth += 1
+            if depth == 0:
+                self._transaction_owner = threading.get_ident()
+            try:
+                yield self
+            except BaseException:
+                self._transaction_depth -= 1
+                if depth == 0:
+                    self._transaction_owner = None
+                self._write(rollback)
+                if self._transaction_depth == 0:
+                    self._create_deferred_indexes()
+                raise
+            
+            self._transaction_depth -= 1
+            if depth == 0:
+                self._transaction_owner = None
+            self._write(commit)
+            if self._transaction_depth == 0:
+                self._create_deferred_indexes()
+    
+    def _commit(self, connection: sqlite3.Connection) -> None:
+        # Inside transaction() the commit happens when the block exits
+        if self._transaction_depth == 0:
+            connection.commit()
+    
+    def _rollback(self, connection: sqlite3.Connection) -> None:
+        # Inside transaction() a failed statement has no effect on its own,
+        # so the rest of the block is left intact
+        if self._transaction_depth == 0:
+            connection.rollback()
     
     def save(self, data: Dict[str, Any]) -> Optional[Any]:
         """
@@ -32,18 +295,21 @@ class SQLRepository(BaseRepository):
         Returns:
             The row ID of the inserted record, or None
         """
-        table = data.get('table')
-        columns = ', '.join(data['values'].keys())
-        placeholders = ', '.join(['?'] * len(data['values']))
-        query = f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"
+        query = _insert_sql(data.get('table'), tuple(data['values'].keys()))
+        
+        def insert(connection):
+            try:
+                cursor = connection.execute(query, tuple(data['values'].values()))
+                self._commit(connection)
+                return cursor.lastrowid
+            except sqlite3.Error:
+                self._rollback(connection)
+                raise
         
         try:
-            self.cursor.execute(query, tuple(data['values'].values()))
-            self.connection.commit()
-            return self.cursor.lastrowid
+            return self._write(insert)
         except sqlite3.Error as e:
             print(f"An error occurred: {e}")
-            self.connection.rollback()
             return None
     
     def load(self, identifier: Dict[str, Any]) -> Optional[tuple]:
@@ -59,14 +325,12 @@ class SQLRepository(BaseRepository):
         Returns:
             A tuple representing the found record, or None
         """
-        table = identifier['table']
-        key = identifier['key']
+        query = _select_sql(identifier['table'], (identifier['key'],))
         value = identifier['value']
-        query = f"SELECT * FROM {table} WHERE {key} = ?"
         
         try:
-            self.cursor.execute(query, (value,))
-            return self.cursor.fetchone()
+            self._record_columns(identifier['table'], (identifier['key'],))
+            return self._read(query, (value,), lambda cursor: cursor.fetchone())
         except sqlite3.Error as e:
             print(f"An error occurred: {e}")
             return None
@@ -84,18 +348,22 @@ class SQLRepository(BaseRepository):
         Returns:
             True if deletion was successful, False otherwise
         """
-        table = identifier['table']
-        key = identifier['key']
+        query = _delete_sql(identifier['table'], identifier['key'])
         value = identifier['value']
-        query = f"DELETE FROM {table} WHERE {key} = ?"
+        
+        def remove(connection):
+            try:
+                cursor = connection.execute(query, (value,))
+                self._commit(connection)
+                return cursor.rowcount > 0
+            except sqlite3.Error:
+                self._rollback(connection)
+                raise
         
         try:
-            self.cursor.execute(query, (value,))
-            self.connection.commit()
-            return self.cursor.rowcount > 0
+            return self._write(remove)
         except sqlite3.Error as e:
             print(f"An error occurred: {e}")
-            self.connection.rollback()
             return False
     
     def get_all(self, table: str) -> List[tuple]:
@@ -111,8 +379,7 @@ class SQLRepository(BaseRepository):
         query = f"SELECT * FROM {table}"
         
         try:
-            self.cursor.execute(query)
-            return self.cursor.fetchall()
+            return self._read(query, (), lambda cursor: cursor.fetchall())
         except sqlite3.Error as e:
             print(f"An error occurred: {e}")
             return []
@@ -129,21 +396,365 @@ class SQLRepository(BaseRepository):
         Returns:
             A list of tuples matching the given criteria
         """
-        table = criteria['table']
         conditions = criteria['conditions']
-        where_clause = " AND ".join([f"{k} = ?" for k in conditions])
-        query = f"SELECT * FROM {table} WHERE {where_clause}"
+        query = _select_sql(criteria['table'], tuple(conditions.keys()))
         
         try:
-            self.cursor.execute(query, tuple(conditions.values()))
-            return self.cursor.fetchall()
+            self._record_columns(criteria['table'], tuple(conditions.keys()))
+            return self._read(query, tuple(conditions.values()), lambda cursor: cursor.fetchall())
         except sqlite3.Error as e:
             print(f"An error occurred: {e}")
             return []
     
+    def _read(self, query: str, params: tuple, fetch: Callable[[sqlite3.Cursor], Any]) -> Any:
+        """
+        Run a read query on the reader connection, recording its plan if it is slow.
+        """
+        started = time.perf_counter()
+        result = fetch(self._reader().execute(query, params))
+        elapsed = time.perf_counter() - started
+        
+        if self.slow_query_threshold is not None and elapsed >= self.slow_query_threshold:
+            self.slow_queries.append({
+                'query': query,
+                'seconds': elapsed,
+                'plan': self.explain(query, params)
+            })
+        return result
+    
+    def explain(self, query: str, params: tuple = ()) -> List[str]:
+        """
+        Return the EXPLAIN QUERY PLAN output for a query.
+        
+        Args:
+            query (str): SQL statement to explain
+            params (tuple): Parameters bound to the statement
+        
+        Returns:
+            The plan steps, e.g. 'SEARCH t USING INDEX idx_t_k (k=?)'
+        """
+        connection = self._reader()
+        # EXPLAIN doesn't reload a schema changed by another connection (e.g. an
+        # index just created by the writer), so touch sqlite_master first
+        connection.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchall()
+        rows = connection.execute(f"EXPLAIN QUERY PLAN {query}", params).fetchall()
+        return [row[-1] for row in rows]
+    
+    def explain_find_by(self, criteria: Dict[str, Any]) -> List[str]:
+        """
+        Return the query plan find_by would use for the given criteria.
+        
+        Args:
+            criteria (dict): A dictionary in the format accepted by find_by
+        
+        Returns:
+            The plan steps
+        """
+        conditions = criteria['conditions']
+        query = _select_sql(criteria['table'], tuple(conditions.keys()))
+        return self.explain(query, tuple(conditions.values()))
+    
+    def _record_columns(self, table: str, columns: Tuple[str, ...]) -> None:
+        """
+        Count a lookup on a column combination, indexing it right away in auto-index mode.
+        """
+        combination = (table, tuple(sorted(columns)))
+        with self._stats_lock:
+            self._query_columns[combination] += 1
+            if not self.auto_index or combination in self._indexed_columns:
+                return
+            if self._transaction_depth > 0:
+                # Creating an index would commit the open transaction early
+                self._deferred_indexes.add(combination)
+                return
+        
+        self._auto_index(combination)
+    
+    def _auto_index(self, combination: Tuple[str, Tuple[str, ...]]) -> None:
+        """
+        Create the index for a combination, marking it indexed only once it exists.
+        """
+        try:
+            self._create_index(*combination)
+        except sqlite3.Error as e:
+            print(f"An error occurred: {e}")
+            return
+        with self._stats_lock:
+            self._indexed_columns.add(combination)
+    
+    def _create_deferred_indexes(self) -> None:
+        with self._stats_lock:
+            deferred = self._deferred_indexes - self._indexed_columns
+            self._deferred_indexes.clear()
+        for combination in sorted(deferred):
+            self._auto_index(combination)
+    
+    def query_stats(self) -> Dict[Tuple[str, Tuple[str, ...]], int]:
+        """
+        Number of find_by/load lookups recorded per (table, columns) combination.
+        """
+        with self._stats_lock:
+            return dict(self._query_columns)
+    
+    def ensure_indexes(self, min_queries: int = 1) -> List[str]:
+        """
+        Create composite indexes for the column combinations find_by/load have queried.
+        
+        Combinations already covered by the leading columns of an existing index,
+        or by an INTEGER PRIMARY KEY, are skipped.
+        
+        Args:
+            min_queries (int): Only index combinations queried at least this often
+        
+        Returns:
+            The names of the indexes created
+        """
+        created = []
+        for (table, columns), count in self.query_stats().items():
+            if count < min_queries:
+                continue
+            try:
+                name = self._create_index(table, columns)
+            except sqlite3.Error as e:
+                print(f"An error occurred: {e}")
+                continue
+            with self._stats_lock:
+                self._indexed_columns.add((table, columns))
+            if name:
+                created.append(name)
+        return created
+    
+    def _create_index(self, table: str, columns: Tuple[str, ...]) -> Optional[str]:
+        """
+        Create an index on the columns unless an existing one already covers them.
+        
+        Returns:
+            The name of the created index, or None if none was needed
+        """
+        connection = self._reader()
+        table_info = connection.execute(f"PRAGMA table_info({table})").fetchall()
+        primary_key = [row for row in table_info if row[5]]
+        if (
+            len(primary_key) == 1
+            and primary_key[0][2].upper() == "INTEGER"
+            and columns == (primary_key[0][1],)
+        ):
+            return None
+        
+        for index in connection.execute(f"PRAGMA index_list({table})").fetchall():
+            info = connection.execute(f"PRAGMA index_info({index[1]})").fetchall()
+            leading = {row[2] for row in sorted(info)[:len(columns)]}
+            if leading == set(columns):
+                return None
+        
+        name = f"idx_{table}_{'_'.join(columns)}"
+        
+        def create(write_connection):
+            write_connection.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})")
+            self._commit(write_connection)
+        
+        self._write(create)
+        return name
+    
+    def iter_all(
+        self,
+        table: str,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        fields: Optional[List[str]] = None,
+        order_by: Optional[str] = None,
+        chunk_size: int = 500
+    ) -> Iterator[tuple]:
+        """
+        Stream records from a table in fetchmany chunks.
+        
+        Args:
+            table (str): Name of the table to fetch records from
+            limit (int): Maximum number of records to yield
+            offset (int): Number of records to skip first
+            fields (list): Columns to select (all columns when None)
+            order_by (str): Column to sort by, prefixed with '-' for descending order
+            chunk_size (int): Number of rows fetched from SQLite at a time
+        
+        Returns:
+            An iterator over tuples representing the selected records
+        """
+        return self._iter_select(table, {}, limit, offset, fields, order_by, chunk_size)
+    
+    def iter_find_by(
+        self,
+        criteria: Dict[str, Any],
+        limit: Optional[int] = None,
+        offset: int = 0,
+        fields: Optional[List[str]] = None,
+        order_by: Optional[str] = None,
+        chunk_size: int = 500
+    ) -> Iterator[tuple]:
+        """
+        Stream records matching specific criteria in fetchmany chunks.
+        
+        Args:
+            criteria (dict): A dictionary in the format accepted by find_by
+            limit (int): Maximum number of records to yield
+            offset (int): Number of matching records to skip first
+            fields (list): Columns to select (all columns when None)
+            order_by (str): Column to sort by, prefixed with '-' for descending order
+            chunk_size (int): Number of rows fetched from SQLite at a time
+        
+        Returns:
+            An iterator over tuples matching the given criteria
+        """
+        self._record_columns(criteria['table'], tuple(criteria['conditions'].keys()))
+        return self._iter_select(
+            criteria['table'], criteria['conditions'], limit, offset, fields, order_by, chunk_size
+        )
+    
+    def _iter_select(
+        self,
+        table: str,
+        conditions: Dict[str, Any],
+        limit: Optional[int],
+        offset: int,
+        fields: Optional[List[str]],
+        order_by: Optional[str],
+        chunk_size: int
+    ) -> Iterator[tuple]:
+        query = f"SELECT {', '.join(fields) if fields else '*'} FROM {table}"
+        params = list(conditions.values())
+        if conditions:
+            query += " WHERE " + " AND ".join([f"{k} = ?" for k in conditions])
+        if order_by:
+            direction = "DESC" if order_by.startswith('-') else "ASC"
+            query += f" ORDER BY {order_by.lstrip('-')} {direction}"
+        if limit is not None or offset:
+            query += " LIMIT ? OFFSET ?"
+            params += [-1 if limit is None else limit, offset]
+        
+        # A dedicated cursor keeps concurrent iterators from clobbering each other
+        cursor = self._reader().cursor()
+        try:
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield from rows
+        except sqlite3.Error as e:
+            print(f"An error occurred: {e}")
+        finally:
+            cursor.close()
+    
+    def save_many(self, items: List[Dict[str, Any]]) -> int:
+        """
+        Insert many records in a single transaction.
+        
+        Records are grouped by table and column set, and each group is
+        written with one executemany call.
+        
+        Args:
+            items (list): Dictionaries in the format accepted by save
+        
+        Returns:
+            The number of rows inserted, or 0 if the transaction was rolled back
+        """
+        def group_key(item):
+            return (item['table'], tuple(item['values'].keys()))
+        
+        def insert_groups(connection):
+            inserted = 0
+            for (table, columns), group in groupby(sorted(items, key=group_key), key=group_key):
+                query = _insert_sql(table, columns)
+                cursor = connection.executemany(query, [tuple(item['values'].values()) for item in group])
+                inserted += cursor.rowcount
+            return inserted
+        
+        try:
+            with self.transaction():
+                return self._write(insert_groups)
+        except sqlite3.Error as e:
+            print(f"An error occurred: {e}")
+            return 0
+    
+    def load_many(self, identifiers: List[Dict[str, Any]]) -> List[Optional[tuple]]:
+        """
+        Load many records, using one IN query per table and key column.
+        
+        Args:
+            identifiers (list): Dictionaries in the format accepted by load
+        
+        Returns:
+            The first matching record for each identifier, in order, or None
+        """
+        found = {}
+        
+        def group_key(identifier):
+            return (identifier['table'], identifier['key'])
+        
+        try:
+            connection = self._reader()
+            for (table, key), group in groupby(sorted(identifiers, key=group_key), key=group_key):
+                self._record_columns(table, (key,))
+                values = list(dict.fromkeys(identifier['value'] for identifier in group))
+                for start in range(0, len(values), MAX_VARIABLES):
+                    chunk = values[start:start + MAX_VARIABLES]
+                    placeholders = ', '.join(['?'] * len(chunk))
+                    cursor = connection.execute(f"SELECT * FROM {table} WHERE {key} IN ({placeholders})", chunk)
+                    position = [column[0] for column in cursor.description].index(key)
+                    for row in cursor.fetchall():
+                        found.setdefault((table, key, row[position]), row)
+        except sqlite3.Error as e:
+            print(f"An error occurred: {e}")
+        
+        return [found.get((i['table'], i['key'], i['value'])) for i in identifiers]
+    
+    def delete_many(self, identifiers: List[Dict[str, Any]]) -> int:
+        """
+        Delete many records in a single transaction.
+        
+        Args:
+            identifiers (list): Dictionaries in the format accepted by delete
+        
+        Returns:
+            The number of rows deleted, or 0 if the transaction was rolled back
+        """
+        def group_key(identifier):
+            return (identifier['table'], identifier['key'])
+        
+        def delete_groups(connection):
+            deleted = 0
+            for (table, key), group in groupby(sorted(identifiers, key=group_key), key=group_key):
+                cursor = connection.executemany(
+                    _delete_sql(table, key),
+                    [(identifier['value'],) for identifier in group]
+                )
+                deleted += cursor.rowcount
+            return deleted
+        
+        try:
+            with self.transaction():
+                return self._write(delete_groups)
+        except sqlite3.Error as e:
+            print(f"An error occurred: {e}")
+            return 0
+    
+    def close(self) -> None:
+        """
+        Stop the writer thread and close every connection.
+        """
+        if self.pooled:
+            if self._writer.is_alive():
+                self._write_queue.put(None)
+                self._writer.join()
+            with self._readers_lock:
+                for connection in self._reader_connections:
+                    connection.close()
+                self._reader_connections.clear()
+        elif self.connection is not None:
+            self.connection.close()
+    
     def __del__(self):
         """
         Ensure the database connection is closed when the object is deleted.
         """
         if hasattr(self, 'connection'):
-            self.connection.close()
\ No newline at end of file
+            self.close()
\ No newline at end of file
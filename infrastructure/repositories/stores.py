@@ -1,5 +1,6 @@
 import os
 from infrastructure.repositories.json_repository import JSONRepository
+from infrastructure.repositories.cached_repository import CachedRepository
 
 # Determine the root project directory (adjust as needed)
 ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -8,8 +9,26 @@ DB_PATH = os.path.join(ROOT_DIR, 'db')
 # Ensure the db directory exists
 os.makedirs(DB_PATH, exist_ok=True)
 
-# Prompt templates using JSONRepository with full path
-prompt_store = JSONRepository(os.path.join(DB_PATH, 'prompts.json'))
+# Seconds between checks of a shared store's files for writes by other
+# processes; its own writes are indexed immediately
+CHECK_INTERVAL = 1.0
 
-# Content store using JSONRepository with full path 
-content_store = JSONRepository(os.path.join(DB_PATH, 'contents.json'))
\ No newline at end of file
+# Prompt templates using JSONRepository with full path (cached: they rarely change)
+prompt_store = CachedRepository(JSONRepository(
+    os.path.join(DB_PATH, 'prompts.json'),
+    indexed_fields=('artifact_type',),
+    check_interval=CHECK_INTERVAL
+))
+
+# Content store using JSONRepository with full path; stored as plain JSON,
+# other formats are opted into through RepositoryFactory's serializer option.
+# Not cached: batch workers write it from other processes, which a cache
+# in front of it would never see
+content_store = JSONRepository(
+    os.path.join(DB_PATH, 'contents.json'),
+    indexed_fields=('type', 'artifact_type', 'project_id'),
+    check_interval=CHECK_INTERVAL,
+    full_text=True,
+    # Only generated text is searched; ids, types and hashes would match every item
+    text_fields=('content',)
+)
\ No newline at end of file
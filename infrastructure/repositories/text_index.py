@@ -0,0 +1,134 @@
+import re
+import heapq
+import math
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase alphanumeric terms.
+    """
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def extract_text(value: Any) -> Iterator[str]:
+    """
+    Yield every string nested anywhere inside a value.
+    """
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for nested in value.values():
+            yield from extract_text(nested)
+    elif isinstance(value, (list, tuple)):
+        for nested in value:
+            yield from extract_text(nested)
+
+
+class InvertedIndex:
+    """
+    An in-memory inverted index ranking items against free text with BM25.
+
+    Each term maps to the keys of the items containing it and its frequency
+    in each, so a search only touches the postings of the query terms.
+    """
+
+    def __init__(self, text_fields: Optional[Iterable[str]] = None, k1: float = 1.2, b: float = 0.75):
+        """
+        Args:
+            text_fields (iterable): Fields whose text is indexed (every string
+                                    in the item when None)
+            k1 (float): BM25 term-frequency saturation
+            b (float): BM25 document-length normalization
+        """
+        self.text_fields = None if text_fields is None else tuple(text_fields)
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._lengths: Dict[str, int] = {}
+        self._item_terms: Dict[str, Tuple[str, ...]] = {}
+        self._total_length = 0
+
+    def _terms(self, item: Dict[str, Any]) -> Counter:
+        value = item if self.text_fields is None else [item.get(field) for field in self.text_fields]
+        terms = Counter()
+        for text in extract_text(value):
+            terms.update(tokenize(text))
+        return terms
+
+    def add(self, key: str, item: Dict[str, Any]) -> None:
+        """
+        Index an item, replacing any previous version under the same key.
+        """
+        self.remove(key)
+        terms = self._terms(item)
+        for term, count in terms.items():
+            self._postings.setdefault(term, {})[key] = count
+        length = sum(terms.values())
+        self._lengths[key] = length
+        self._item_terms[key] = tuple(terms)
+        self._total_length += length
+
+    def remove(self, key: str) -> None:
+        """
+        Drop an item from the index.
+        """
+        length = self._lengths.pop(key, None)
+        if length is None:
+            return
+        self._total_length -= length
+        for term in self._item_terms.pop(key):
+            postings = self._postings[term]
+            del postings[key]
+            if not postings:
+                del self._postings[term]
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._lengths.clear()
+        self._item_terms.clear()
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def search(
+        self,
+        text: str,
+        top_k: Optional[int] = 10,
+        candidates: Optional[Set[str]] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Rank indexed items against a query.
+
+        Args:
+            text (str): Free-text query
+            top_k (int): Maximum number of results (all matches when None)
+            candidates (set): Restrict results to these keys
+
+        Returns:
+            (key, score) pairs, best first, for items containing any query term
+        """
+        count = len(self._lengths)
+        if not count:
+            return []
+        average_length = self._total_length / count or 1.0
+
+        scores: Dict[str, float] = {}
+        for term in set(tokenize(text)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for key, frequency in postings.items():
+                if candidates is not None and key not in candidates:
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[key] / average_length)
+                scores[key] = scores.get(key, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+
+        if top_k is None:
+            return sorted(scores.items(), key=lambda pair: pair[1], reverse=True)
+        return heapq.nlargest(top_k, scores.items(), key=lambda pair: pair[1])
@@ -0,0 +1,295 @@
+import time
+import threading
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+from base_repository import BaseRepository
+
+
+class WriteBehindRepository(BaseRepository):
+    """
+    A write-behind queue in front of any BaseRepository implementation.
+
+    save/delete only record the change and return immediately. A background
+    worker coalesces pending changes (the latest write per id wins), groups
+    saves by artifact type and flushes them with save_many once max_batch
+    changes are pending or flush_interval seconds have passed. Reads overlay
+    pending changes on the wrapped repository, so callers see their own writes.
+    Call flush() or close() when the data must be durable.
+    """
+
+    def __init__(
+        self,
+        repository: BaseRepository,
+        flush_interval: float = 1.0,
+        max_batch: int = 500,
+        group_field: str = 'type'
+    ):
+        """
+        Start the background writer.
+
+        Args:
+            repository (BaseRepository): The repository writes are flushed to
+            flush_interval (float): Seconds after the first pending change before a flush
+            max_batch (int): Number of pending changes that triggers an immediate flush
+            group_field (str): Field used to group saves into save_many batches
+        """
+        self.repository = repository
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.group_field = group_field
+
+        self._condition = threading.Condition()
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._deleted: Dict[str, Any] = {}
+        self._inflight_saves: Dict[str, Dict[str, Any]] = {}
+        self._inflight_deletes: Dict[str, Any] = {}
+        self._first_pending_at: Optional[float] = None
+        self._flush_requested = False
+        self._closed = False
+        self._error: Optional[Exception] = None
+
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def __getattr__(self, name: str) -> Any:
+        if name == 'repository':
+            raise AttributeError(name)
+        return getattr(self.repository, name)
+
+    def _mark_pending(self) -> None:
+        # Called with the condition held; wakes the worker to start its flush
+        # timer on the first pending change, and again once a batch is full
+        if self._first_pending_at is None:
+            self._first_pending_at = time.monotonic()
+            self._condition.notify_all()
+        elif len(self._pending) + len(self._deleted) >= self.max_batch:
+            self._condition.notify_all()
+
+    def save(self, data: Dict[str, Any]) -> Optional[str]:
+        """
+        Queue an item to be saved.
+
+        Args:
+            data (dict): The data to be saved, expected to have an 'id' key
+
+        Returns:
+            The identifier of the queued item
+        """
+        self.save_many([data])
+        return data['id']
+
+    def save_many(self, items: List[Dict[str, Any]]) -> int:
+        """
+        Queue many items to be saved.
+
+        Args:
+            items (list): Items to be saved, each expected to have an 'id' key
+
+        Returns:
+            The number of items queued
+        """
+        if any(item.get('id') is None for item in items):
+            raise ValueError("Data must include an 'id' field")
+
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Write-behind repository is closed")
+            for item in items:
+                key = str(item['id'])
+                self._pending[key] = item
+                self._deleted.pop(key, None)
+            self._mark_pending()
+        return len(items)
+
+    def delete(self, identifier: Any) -> bool:
+        """
+        Queue an item to be deleted.
+
+        Args:
+            identifier: Unique identifier of the item to delete
+
+        Returns:
+            True if the item existed, False otherwise
+        """
+        return self.delete_many([identifier]) == 1
+
+    def delete_many(self, identifiers: List[Any]) -> int:
+        """
+        Queue many items to be deleted.
+
+        Args:
+            identifiers (list): Unique identifiers of the items to delete
+
+        Returns:
+            The number of queued deletions for items that existed
+        """
+        deleted = 0
+        for identifier in identifiers:
+            key = str(identifier)
+            with self._condition:
+                if self._closed:
+                    raise RuntimeError("Write-behind repository is closed")
+                if key in self._deleted:
+                    continue
+                existed = self._pending.pop(key, None) is not None or key in self._inflight_saves
+            if not existed and key not in self._inflight_deletes:
+                existed = self.repository.load(identifier) is not None
+            if existed:
+                with self._condition:
+                    self._deleted[key] = identifier
+                    self._mark_pending()
+                deleted += 1
+        return deleted
+
+    def _overlay(self):
+        """
+        Snapshot the changes not yet visible in the wrapped repository.
+
+        Returns:
+            (pending saves by key, keys whose stored version is superseded or deleted)
+        """
+        with self._condition:
+            saves = {**self._inflight_saves, **self._pending}
+            for key in self._deleted:
+                saves.pop(key, None)
+            shadowed = set(saves) | set(self._deleted) | set(self._inflight_deletes)
+        return saves, shadowed
+
+    def load(self, identifier: Any) -> Optional[Dict[str, Any]]:
+        """
+        Load an item, preferring its pending version.
+        """
+        saves, shadowed = self._overlay()
+        key = str(identifier)
+        if key in saves:
+            return dict(saves[key])
+        if key in shadowed:
+            return None
+        return self.repository.load(identifier)
+
+    def get_all(self) -> List[Dict[str, Any]]:
+        """
+        Retrieve all items, including pending ones.
+        """
+        return self.find_by({})
+
+    def find_by(self, criteria: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Find items matching criteria, including pending ones.
+        """
+        # Snapshot before reading so an item flushed in between is seen once
+        saves, shadowed = self._overlay()
+        stored = self.repository.find_by(criteria) if criteria else self.repository.get_all()
+        results = [item for item in stored if str(item.get('id')) not in shadowed]
+        results.extend(
+            dict(item) for item in saves.values()
+            if all(item.get(k) == v for k, v in criteria.items())
+        )
+        return results
+
+    def search(self, text: str, criteria: Optional[Dict[str, Any]] = None, top_k: Optional[int] = 10) -> List[Dict[str, Any]]:
+        """
+        Search the wrapped repository's index, or scan with pending changes
+        overlaid while any are queued.
+        """
+        saves, shadowed = self._overlay()
+        if shadowed:
+            return super().search(text, criteria, top_k)
+        return self.repository.search(text, criteria, top_k)
+
+    def _due(self) -> bool:
+        if not self._pending and not self._deleted:
+            return False
+        if self._flush_requested:
+            return True
+        if len(self._pending) + len(self._deleted) >= self.max_batch:
+            return True
+        return time.monotonic() - self._first_pending_at >= self.flush_interval
+
+    def _run(self) -> None:
+        with self._condition:
+            while True:
+                while not self._due():
+                    if self._closed:
+                        return
+                    timeout = None
+                    if self._first_pending_at is not None:
+                        timeout = max(0.0, self._first_pending_at + self.flush_interval - time.monotonic())
+                    self._condition.wait(timeout)
+                self._write_batch()
+
+    def _write_batch(self) -> None:
+        """
+        Flush the pending changes; called by the worker with the condition held.
+        """
+        saves, deletes = self._pending, self._deleted
+        self._pending, self._deleted = {}, {}
+        self._inflight_saves, self._inflight_deletes = saves, deletes
+        self._first_pending_at = None
+
+        error = None
+        self._condition.release()
+        try:
+            groups = defaultdict(list)
+            for item in saves.values():
+                groups[item.get(self.group_field)].append(item)
+            for group in groups.values():
+                # Backends report failed writes through the count rather than raising
+                saved = self.repository.save_many(group)
+                if saved < len(group):
+                    raise IOError(f"Only {saved} of {len(group)} queued items were saved")
+            if deletes:
+                self.repository.delete_many(list(deletes.values()))
+        except Exception as e:
+            print(f"Error flushing writes: {e}")
+            error = e
+        finally:
+            self._condition.acquire()
+
+        if error is not None:
+            # Requeue whatever hasn't been superseded since, and retry later
+            for key, item in saves.items():
+                if key not in self._deleted:
+                    self._pending.setdefault(key, item)
+            for key, identifier in deletes.items():
+                if key not in self._pending:
+                    self._deleted.setdefault(key, identifier)
+            if self._pending or self._deleted:
+                self._first_pending_at = time.monotonic()
+            self._error = error
+            self._flush_requested = False
+
+        self._inflight_saves, self._inflight_deletes = {}, {}
+        self._condition.notify_all()
+
+    def flush(self) -> None:
+        """
+        Write all pending changes and wait until they are stored.
+
+        Raises:
+            The error of a failed flush; its changes stay queued for a retry
+        """
+        with self._condition:
+            self._flush_requested = True
+            self._condition.notify_all()
+            while (
+                (self._pending or self._deleted or self._inflight_saves or self._inflight_deletes)
+                and self._error is None
+            ):
+                self._condition.wait()
+            self._flush_requested = False
+            error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def close(self) -> None:
+        """
+        Flush pending changes and stop the background worker.
+        """
+        try:
+            self.flush()
+        finally:
+            with self._condition:
+                self._closed = True
+                self._condition.notify_all()
+            self._worker.join()
@@ -0,0 +1,105 @@
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # Room for the simultaneous connects of a wide fan-out
+    request_queue_size = 128
+
+
+def response(status=200, body=None, headers=None, delay=0.0):
+    """
+    A scripted StubServer response, sent after waiting delay seconds.
+    """
+    return status, headers or {}, {'ok': True} if body is None else body, delay
+
+
+class StubServer:
+    """
+    Local HTTP server replaying scripted responses per path.
+
+    Responses are built with response(); once a path's script is
+    used up its last response is repeated. Every request is recorded with the
+    time it arrived.
+    """
+
+    def __init__(self):
+        self.scripts = defaultdict(deque)
+        self.requests = []
+        self._lock = threading.Lock()
+        self._server = _Server(('127.0.0.1', 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def script(self, path, *responses):
+        self.scripts[path].extend(responses)
+
+    def requests_to(self, path):
+        return [request for request in self.requests if request['path'] == path]
+
+    def _next_response(self, path):
+        with self._lock:
+            script = self.scripts[path]
+            if not script:
+                return response()
+            return script.popleft() if len(script) > 1 else script[0]
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _respond(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else b''
+                with server._lock:
+                    server.requests.append({
+                        'method': self.command,
+                        'path': self.path,
+                        'headers': dict(self.headers),
+                        'body': body,
+                        'at': time.monotonic()
+                    })
+                status, headers, payload, delay = server._next_response(self.path)
+                if delay:
+                    time.sleep(delay)
+                content = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+            do_GET = do_POST = do_PUT = do_DELETE = _respond
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def stub_server():
+    server = StubServer().start()
+    yield server
+    server.stop()
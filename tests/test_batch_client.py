@@ -0,0 +1,26 @@
+import json
+
+from conftest import response
+from infrastructure.external_services.batch_client import BatchClient
+from infrastructure.external_services.retry_policy import RetryPolicy
+from infrastructure.external_services.service_integrator import ServiceIntegrator
+
+
+def test_retried_upload_sends_the_whole_file(stub_server, tmp_path):
+    stub_server.script('/files', response(503), response(200, {'id': 'file-1'}))
+    stub_server.script('/batches', response(200, {'id': 'batch-1'}))
+    client = BatchClient(
+        ServiceIntegrator(stub_server.url, timeout=5, retry_policy=RetryPolicy(base_delay=0.0)),
+        batch_dir=str(tmp_path)
+    )
+    path = client.write_batch_file({'p1': {'q': 1}, 'p2': {'q': 2}})
+
+    assert client.submit(path) == 'batch-1'
+
+    with open(path, 'rb') as file:
+        content = file.read()
+    uploads = stub_server.requests_to('/files')
+    assert len(uploads) == 2
+    assert all(content in upload['body'] for upload in uploads)
+    batch, = stub_server.requests_to('/batches')
+    assert json.loads(batch['body'])['input_file_id'] == 'file-1'
@@ -0,0 +1,41 @@
+from application.ContextSelector import ContextSelector
+from infrastructure.external_services.rate_limiter import estimate_tokens
+
+QUESTIONNAIRE = {
+    'id': 'p1-questionnaire',
+    'type': 'questionnaire',
+    'content_hash': 'f' * 64,
+    'answers': {f'q{index}': 'Payments are reconciled every night. ' * 15 for index in range(80)}
+}
+STAKEHOLDER = {'id': 's1', 'type': 'stakeholder', 'name': 'Alice', 'role': 'CFO'}
+
+
+def test_item_over_budget_is_truncated_not_dropped():
+    selector = ContextSelector(token_budget=8000)
+    assert estimate_tokens(QUESTIONNAIRE) > 8000
+
+    selected, dropped = selector.partition({'subject': 'Stakeholders'}, [STAKEHOLDER, QUESTIONNAIRE])
+
+    assert dropped == []
+    fitted = next(item for item in selected if item['id'] == 'p1-questionnaire')
+    assert estimate_tokens(fitted) <= 8000
+    assert fitted['content_hash'] == QUESTIONNAIRE['content_hash']
+    assert STAKEHOLDER in selected
+
+
+def test_ranking_ignores_bookkeeping_fields():
+    items = [
+        {'id': 'payments-1', 'type': 'user_story', 'content': 'Export the audit log'},
+        {'id': 'story-2', 'type': 'user_story', 'content': 'Refund failed payments'},
+    ]
+
+    selected = ContextSelector().select({'subject': 'payments'}, items)
+
+    assert [item['id'] for item in selected] == ['story-2', 'payments-1']
+
+
+def test_max_items_reports_the_rest_as_dropped():
+    selected, dropped = ContextSelector(max_items=1).partition({'subject': 'CFO'}, [QUESTIONNAIRE, STAKEHOLDER])
+
+    assert selected == [STAKEHOLDER]
+    assert dropped == [QUESTIONNAIRE]
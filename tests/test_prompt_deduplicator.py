@@ -0,0 +1,28 @@
+from application.PromptDeduplicator import PromptDeduplicator, context_text
+
+STAKEHOLDERS = [
+    {'id': 's1', 'type': 'stakeholder', 'name': 'Alice', 'role': 'CFO'},
+    {'id': 's2', 'type': 'stakeholder', 'name': 'Bob', 'role': 'CTO'},
+    {'id': 's3', 'type': 'stakeholder', 'name': 'Alice', 'role': 'CFO', 'content_hash': 'abc'},
+    {'id': 's4', 'type': 'stakeholder', 'name': 'Dan', 'role': 'Support'},
+]
+
+
+def test_distinct_contexts_of_one_template_stay_apart():
+    # Compared by context alone, not the template text every prompt shares
+    deduplicator = PromptDeduplicator(threshold=0.9)
+    texts = [context_text(context) for context in STAKEHOLDERS]
+
+    assert deduplicator.group(texts) == [[0, 2], [1], [3]]
+
+
+def test_near_duplicate_contexts_are_grouped():
+    deduplicator = PromptDeduplicator(threshold=0.8)
+    notes = ' '.join(f'word{index}' for index in range(60))
+    texts = [
+        context_text({'id': 'a', 'notes': notes}),
+        context_text({'id': 'b', 'notes': notes + ' extra'}),
+        context_text({'id': 'c', 'notes': 'something else entirely'}),
+    ]
+
+    assert deduplicator.group(texts) == [[0, 1], [2]]
@@ -0,0 +1,195 @@
+import asyncio
+import time
+
+import pytest
+import requests
+
+from conftest import response
+from infrastructure.external_services.hedged_integrator import HedgedServiceIntegrator
+from infrastructure.external_services.retry_policy import RetryPolicy
+from infrastructure.external_services.service_integrator import RequestMethod, ServiceIntegrator
+
+
+def integrator(server, **policy):
+    # No backoff, so retries are immediate unless the server asks otherwise
+    return ServiceIntegrator(server.url, timeout=5, retry_policy=RetryPolicy(base_delay=0.0, **policy))
+
+
+@pytest.mark.parametrize('status', [429, 503])
+def test_safe_statuses_are_retried_for_any_method(stub_server, status):
+    stub_server.script('/chat', response(status), response(200, {'answer': 42}))
+
+    with integrator(stub_server) as client:
+        result = client.make_request('chat', RequestMethod.POST, json={'q': 1})
+
+    assert result['data'] == {'answer': 42}
+    assert len(stub_server.requests_to('/chat')) == 2
+
+
+@pytest.mark.parametrize('status', [408, 500, 502, 504])
+def test_idempotent_statuses_are_not_retried_for_post(stub_server, status):
+    stub_server.script('/chat', response(status), response(200))
+
+    with integrator(stub_server) as client, pytest.raises(requests.HTTPError):
+        client.make_request('chat', RequestMethod.POST, json={'q': 1})
+
+    assert len(stub_server.requests_to('/chat')) == 1
+
+
+@pytest.mark.parametrize('method, options', [
+    (RequestMethod.GET, {}),
+    (RequestMethod.POST, {'idempotent': True}),
+    (RequestMethod.POST, {'headers': {'Idempotency-Key': 'k1'}}),
+])
+def test_idempotent_statuses_are_retried_for_idempotent_requests(stub_server, method, options):
+    stub_server.script('/items', response(500), response(502), response(200))
+
+    with integrator(stub_server) as client:
+        result = client.make_request('items', method, **options)
+
+    assert result['status_code'] == 200
+    assert len(stub_server.requests_to('/items')) == 3
+
+
+def test_client_errors_are_not_retried(stub_server):
+    stub_server.script('/items', response(404))
+
+    with integrator(stub_server) as client, pytest.raises(requests.HTTPError):
+        client.make_request('items', RequestMethod.GET)
+
+    assert len(stub_server.requests_to('/items')) == 1
+
+
+def test_retries_stop_after_max_attempts(stub_server):
+    stub_server.script('/chat', response(503))
+
+    with integrator(stub_server, max_attempts=3) as client, pytest.raises(requests.HTTPError):
+        client.make_request('chat', RequestMethod.POST, json={'q': 1})
+
+    assert len(stub_server.requests_to('/chat')) == 3
+
+
+def test_retry_after_is_honored(stub_server):
+    stub_server.script('/chat', response(429, headers={'Retry-After': '0.5'}), response(200))
+
+    with integrator(stub_server) as client:
+        client.make_request('chat', RequestMethod.POST, json={'q': 1})
+
+    first, second = stub_server.requests_to('/chat')
+    assert second['at'] - first['at'] >= 0.5
+
+
+def test_hedge_fires_after_the_budget(stub_server):
+    stub_server.script('/slow/chat', response(200, {'from': 'primary'}, delay=1.5))
+    stub_server.script('/fast/chat', response(200, {'from': 'secondary'}))
+    primary = ServiceIntegrator(f"{stub_server.url}/slow", timeout=5)
+    secondary = ServiceIntegrator(f"{stub_server.url}/fast", timeout=5)
+
+    with HedgedServiceIntegrator(primary, secondary, hedge_after=0.2) as hedged:
+        started = time.monotonic()
+        result = hedged.make_request('chat', json={'q': 1})
+        elapsed = time.monotonic() - started
+
+    assert result['data'] == {'from': 'secondary'}
+    assert 0.2 <= elapsed < 1.5
+    assert len(stub_server.requests_to('/slow/chat')) == 1
+    secondary_request, = stub_server.requests_to('/fast/chat')
+    assert secondary_request['at'] - started >= 0.2
+
+
+def test_no_hedge_within_the_budget(stub_server):
+    stub_server.script('/slow/chat', response(200, {'from': 'primary'}))
+    primary = ServiceIntegrator(f"{stub_server.url}/slow", timeout=5)
+    secondary = ServiceIntegrator(f"{stub_server.url}/fast", timeout=5)
+
+    with HedgedServiceIntegrator(primary, secondary, hedge_after=1.0) as hedged:
+        result = hedged.make_request('chat', json={'q': 1})
+
+    assert result['data'] == {'from': 'primary'}
+    assert stub_server.requests_to('/fast/chat') == []
+
+
+def test_hedge_fires_at_once_when_the_primary_fails(stub_server):
+    stub_server.script('/slow/chat', response(404))
+    stub_server.script('/fast/chat', response(200, {'from': 'secondary'}))
+    primary = ServiceIntegrator(f"{stub_server.url}/slow", timeout=5)
+    secondary = ServiceIntegrator(f"{stub_server.url}/fast", timeout=5)
+
+    with HedgedServiceIntegrator(primary, secondary, hedge_after=1.0) as hedged:
+        started = time.monotonic()
+        result = hedged.make_request('chat', json={'q': 1})
+        elapsed = time.monotonic() - started
+
+    assert result['data'] == {'from': 'secondary'}
+    assert elapsed < 1.0
+
+
+def test_hedged_stream_reads_from_the_primary(stub_server):
+    stub_server.script('/slow/chat', response(200, {'from': 'primary'}))
+    primary = ServiceIntegrator(f"{stub_server.url}/slow", timeout=5)
+    secondary = ServiceIntegrator(f"{stub_server.url}/fast", timeout=5)
+
+    with HedgedServiceIntegrator(primary, secondary) as hedged:
+        chunks = list(hedged.stream_request('chat', json={'q': 1}, stream_format='ndjson'))
+
+    assert chunks == [{'from': 'primary'}]
+    assert stub_server.requests_to('/fast/chat') == []
+
+
+def test_gather_runs_max_concurrency_requests_at_once(stub_server):
+    # Wider than asyncio's default executor, which has at most 32 threads
+    stub_server.script('/chat', response(200, delay=0.5))
+
+    with integrator(stub_server) as client:
+        started = time.monotonic()
+        responses = asyncio.run(client.gather_requests(
+            'chat', [{'q': index} for index in range(40)], max_concurrency=40
+        ))
+        elapsed = time.monotonic() - started
+
+    assert [result['status_code'] for result in responses] == [200] * 40
+    assert elapsed < 1.0
+    assert client.pool_maxsize == 40
+
+
+def test_hedged_gather_runs_max_concurrency_requests_at_once(stub_server):
+    stub_server.script('/slow/chat', response(200, delay=0.5))
+    primary = ServiceIntegrator(f"{stub_server.url}/slow", timeout=5)
+    secondary = ServiceIntegrator(f"{stub_server.url}/fast", timeout=5)
+
+    with HedgedServiceIntegrator(primary, secondary, hedge_after=5.0) as hedged:
+        started = time.monotonic()
+        asyncio.run(hedged.gather_requests('chat', [{'q': index} for index in range(40)], max_concurrency=40))
+        elapsed = time.monotonic() - started
+
+    assert elapsed < 1.0
+
+
+def test_gather_pulls_payloads_as_slots_free_up(stub_server):
+    stub_server.script('/chat', response(200, delay=0.3))
+    pulled = []
+
+    def payloads():
+        for index in range(4):
+            pulled.append(time.monotonic())
+            yield {'q': index}
+
+    with integrator(stub_server) as client:
+        started = time.monotonic()
+        responses = asyncio.run(client.gather_requests('chat', payloads(), max_concurrency=2))
+
+    assert len(responses) == 4
+    assert pulled[1] - started < 0.3 <= pulled[2] - started
+
+
+def test_gather_keeps_payload_order_and_returns_failures(stub_server):
+    stub_server.script('/chat', response(200, {'n': 1}), response(404), response(200, {'n': 3}))
+
+    with integrator(stub_server) as client:
+        responses = asyncio.run(client.gather_requests(
+            'chat', iter([{'q': 1}, {'q': 2}, {'q': 3}]), max_concurrency=1, return_exceptions=True
+        ))
+
+    assert responses[0]['data'] == {'n': 1}
+    assert isinstance(responses[1], requests.HTTPError)
+    assert responses[2]['data'] == {'n': 3}